@@ -0,0 +1,83 @@
+# imports
+import io
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+
+# available estimators
+BACKENDS = ["random_forest", "hist_gradient_boosting", "shallow_forest"]
+DEFAULT_BACKEND = "random_forest"
+
+# batch sizes timed in the report
+BATCH_SIZES = [1, 100, 100000]
+
+def make_model(backend=DEFAULT_BACKEND, params=None):
+    "Builds an unfitted estimator for a backend, params override the defaults."
+    params = params or {}
+    if backend == "random_forest":
+        return RandomForestRegressor(**{"n_estimators": 100, "random_state": 42, **params})
+    if backend == "hist_gradient_boosting":
+        return HistGradientBoostingRegressor(**{"random_state": 42, **params})
+    if backend == "shallow_forest":
+        # fewer trees with a capped number of leaves, small pickle and cheap predict
+        return RandomForestRegressor(**{"n_estimators": 50, "max_leaf_nodes": 64, "random_state": 42, **params})
+    raise ValueError(f"Invalid backend: {backend}. Choose from {BACKENDS}")
+
+def predict_throughput(model, X, n_rows, repeats=5):
+    "Rows per second for one predict call on a batch of n rows."
+    batch = X.iloc[np.resize(np.arange(len(X)), n_rows)]
+    timings = []
+    for _ in range(repeats if n_rows < 10000 else 1):
+        start = time.perf_counter()
+        model.predict(batch)
+        timings.append(time.perf_counter() - start)
+    return n_rows / min(timings)
+
+def compare_backends(X_train, X_test, y_train, y_test, backends=BACKENDS):
+    "Fits every backend on the same split and compares cost and accuracy."
+    rows = []
+    for backend in backends:
+        model = make_model(backend)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        y_pred = model.predict(X_test)
+
+        # size of the pickled artefact
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+
+        row = {
+            "Backend": backend,
+            "FitSeconds": round(fit_time, 3),
+            "SizeKB": round(buffer.tell() / 1024, 1),
+            "R2": round(r2_score(y_test, y_pred), 4),
+            "MAE": round(mean_absolute_error(y_test, y_pred), 2),
+        }
+        for n_rows in BATCH_SIZES:
+            row[f"RowsPerSec@{n_rows}"] = int(predict_throughput(model, X_test, n_rows))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    from sklearn.model_selection import train_test_split
+    from Fab4_Model_Train import prepare_player_data
+    from Fab4_Paths import files
+
+    # same split as Fab4_Model_Train.py for every player
+    reports = []
+    for player_name, file_path in files.items():
+        X, y, label_encoder = prepare_player_data(file_path)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+        report = compare_backends(X_train, X_test, y_train, y_test)
+        report.insert(0, "Player", player_name)
+        reports.append(report)
+
+    print("\nBACKEND SPEED / ACCURACY REPORT")
+    print(pd.concat(reports, ignore_index=True).to_string(index=False))
@@ -0,0 +1,85 @@
+# imports
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from joblib import Memory
+from sklearn.metrics import mean_absolute_error, root_mean_squared_error
+from Fab4_Backends import BACKENDS, DEFAULT_BACKEND, make_model
+from Fab4_Build_Manifest import code_hash, file_hash
+from Fab4_Model_Train import TRAINING_CODE, prepare_player_data
+from Fab4_Paths import files
+
+# cached feature matrices and reports
+memory = Memory("CACHE/", verbose=0)
+report_dir = "REPORTS/"
+
+@memory.cache
+def cutoff_matrices(file_path, data_hash, training_code_hash, cutoff):
+    "Train rows up to the cutoff year and test rows from the next year, cached per data and feature code version."
+    X, y, label_encoder = prepare_player_data(file_path)
+    train = (X["Year"] <= cutoff).to_numpy()
+    test = (X["Year"] == cutoff + 1).to_numpy()
+    return X[train], y[train], X[test], y[test]
+
+def cutoff_years(file_path):
+    "Every year that has earlier seasons to train on and a following season to score."
+    years = np.sort(pd.read_csv(file_path, usecols=["Year"])["Year"].unique())
+    return [year for year in years[1:] if year + 1 in years]
+
+def backtest_cutoff(player_name, file_path, data_hash, training_code_hash, cutoff, backend):
+    "Trains on innings up to the cutoff and scores the next year's innings."
+    X_train, y_train, X_test, y_test = cutoff_matrices(file_path, data_hash, training_code_hash, cutoff)
+    model = make_model(backend)
+    model.fit(X_train, y_train)
+    y_pred = model.predict(X_test)
+
+    return {
+        "Player": player_name,
+        "Year": cutoff + 1,
+        "TrainInnings": len(X_train),
+        "Innings": len(X_test),
+        "MAE": round(mean_absolute_error(y_test, y_pred), 2),
+        "RMSE": round(root_mean_squared_error(y_test, y_pred), 2),
+        "ActualRuns": int(y_test.sum()),
+        "PredictedRuns": int(round(y_pred.sum())),
+    }
+
+def run_backtest(backend=DEFAULT_BACKEND, workers=None):
+    "Walk-forward backtest over every player and cutoff year on a process pool."
+    # joblib only tracks the cached function's own source, the feature code is hashed into the key
+    training_code_hash = code_hash(TRAINING_CODE)
+    tasks = []
+    for player_name, file_path in files.items():
+        data_hash = file_hash(file_path)
+        for cutoff in cutoff_years(file_path):
+            tasks.append((player_name, file_path, data_hash, training_code_hash, cutoff, backend))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(backtest_cutoff, *zip(*tasks)))
+
+    return pd.DataFrame(rows).sort_values(["Player", "Year"]).reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the Fab4 innings models.")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--workers", type=int, default=None, help="processes to use, all cores by default")
+    args = parser.parse_args()
+
+    results = run_backtest(args.backend, args.workers)
+
+    # save the full table
+    os.makedirs(report_dir, exist_ok=True)
+    output_file = f"{report_dir}backtest_{args.backend}.csv"
+    results.to_csv(output_file, index=False)
+
+    print("\nWALK-FORWARD MAE PER PLAYER AND YEAR")
+    print(results.pivot(index="Player", columns="Year", values="MAE").to_string())
+    print("\nOVERALL")
+    overall = results.groupby("Player").apply(
+        lambda df: pd.Series({"MAE": np.average(df["MAE"], weights=df["Innings"]), "Innings": df["Innings"].sum()}),
+        include_groups=False)
+    print(overall.round(2).to_string())
+    print(f"\n✅ Saved backtest results to {output_file}")
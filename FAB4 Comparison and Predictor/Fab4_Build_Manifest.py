@@ -0,0 +1,61 @@
+# imports
+import hashlib
+import json
+import os
+
+# build state, one entry per step
+MANIFEST_PATH = "BUILD_MANIFEST.json"
+
+def file_hash(path):
+    "SHA-256 of a file's contents, None if it does not exist."
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def code_hash(paths):
+    "Combined hash of several source files, for cache keys that must change whenever the code does."
+    return hashlib.sha256("|".join(file_hash(path) or "" for path in paths).encode()).hexdigest()
+
+class BuildManifest:
+    "Records the content hashes each step was built from so unchanged steps can be skipped."
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.steps = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.steps = json.load(f)
+
+    def signature(self, inputs, code, params):
+        return {
+            "inputs": {path: file_hash(path) for path in inputs},
+            "code": {path: file_hash(path) for path in code},
+            "params": params,
+        }
+
+    def is_current(self, step, inputs, outputs, code, params=None):
+        "True when the inputs, code and params match the last build and its outputs are untouched."
+        recorded = self.steps.get(step)
+        if recorded is None:
+            return False
+        if recorded["signature"] != self.signature(inputs, code, params or {}):
+            return False
+        return all(file_hash(path) == recorded["outputs"].get(path) for path in outputs)
+
+    def params(self, step):
+        "Params the step was last built with, empty if it has not been built."
+        recorded = self.steps.get(step)
+        return recorded["signature"]["params"] if recorded else {}
+
+    def record(self, step, inputs, outputs, code, params=None):
+        "Saves the hashes of a step that has just been built."
+        self.steps[step] = {
+            "signature": self.signature(inputs, code, params or {}),
+            "outputs": {path: file_hash(path) for path in outputs},
+        }
+        with open(self.path, "w") as f:
+            json.dump(self.steps, f, indent=4)
@@ -1,14 +1,10 @@
 # imports
 import pandas as pd
 import matplotlib.pyplot as plt
-
-# file paths
-files = {
-    "Joe Root": "CLEANED_DATA/JE_ROOT_MERGED.csv",
-    "Kane Williamson": "CLEANED_DATA/KS_WILLIAMSON_MERGED.csv",
-    "Steve Smith": "CLEANED_DATA/SPD_SMITH_MERGED.csv",
-    "Virat Kohli": "CLEANED_DATA/V_KOHLI_MERGED.csv",
-}
+from Fab4_Database import open_database, innings_query
+from Fab4_Leaderboard import build_population
+from Fab4_Scoring import percentile_arrays, score_columns, unscored_metrics
+from Fab4_Paths import files
 
 # metrics list
 metrics_list = [
@@ -42,6 +38,8 @@ while True:
 # select filters
 filters_list = ["Filter by Home/Away", "Filter by Year Range", "Filter by Opposition"]
 print("Choose Filters to Apply (comma-separated, enter 0 for none):")
+print("Filtered metrics are still scored against the whole careers of every batter in D24_CLEAN.csv, "
+      "so a few innings score low on totals like runs and centuries.")
 for i, fltr in enumerate(filters_list, 1):
     print(f"{i}. {fltr}")
 
@@ -82,37 +80,25 @@ if '2' in selected_filters:
 if '3' in selected_filters:
     opposition = input("Enter Opposition Team: ").strip().lower()
 
-# fixed max values assigned based on available data to assign scores
-MAX_VALUES = {
-    "Total Runs": 10000,
-    "Batting Average": 100,
-    "Strike Rate": 70,
-    "Fifty Plus Scores": 100,
-    "Half Centuries": 75,
-    "Centuries": 50,
-    "Double Centuries": 10,
-    "Boundaries (4s + 6s)": 1000,
-    "Peak Year": 2000
-}
-
-# normalize metrics
-def normalize(value, max_val):
-    return round(10 * (value / max_val), 2) if max_val else 0
-
-# normalize batting average
-def normalize_batting_avg(avg):
-    return round((avg / 100) * 10, 2)
+# indexed queries when Fab4_PreProcessing.py --sqlite has built a current database
+db = open_database()
+innings_columns = ['Runs', 'BallsFaced', 'Fours', 'Sixes', 'MatchInning', 'Year']
 
 # assign filters and extract records as required
 all_results = {}
+innings_counts = {}
 for player, file in files.items():
-    df = pd.read_csv(file)
-    if '1' in selected_filters:
-        df = df[df['Home/Away'] == home_away]
-    if '2' in selected_filters:
-        df = df[(df['Year'] >= start_year) & (df['Year'] <= end_year)]
-    if '3' in selected_filters:
-        df = df[df['Opposition'].str.contains(opposition, case=False)]
+    if db is not None:
+        # only the filtered innings and the columns the metrics use are read
+        df = innings_query(db, player, innings_columns, home_away, start_year, end_year, opposition)
+    else:
+        df = pd.read_csv(file)
+        if '1' in selected_filters:
+            df = df[df['Home/Away'] == home_away]
+        if '2' in selected_filters:
+            df = df[(df['Year'] >= start_year) & (df['Year'] <= end_year)]
+        if '3' in selected_filters:
+            df = df[df['Opposition'].str.contains(opposition, case=False)]
     
     metrics_results = {}
     
@@ -134,7 +120,8 @@ for player, file in files.items():
     if "Half Centuries" in selected_metrics:
         metrics_results['Half Centuries'] = int(len(df[(df['Runs'] >= 50) & (df['Runs'] < 100)]))
     if "Centuries" in selected_metrics:
-        metrics_results['Centuries'] = int(len(df[(df['Runs'] >= 100) & (df['Runs'] < 200)]))
+        # every hundred, like the D24 centuries it is ranked against
+        metrics_results['Centuries'] = int(len(df[df['Runs'] >= 100]))
     if "Double Centuries" in selected_metrics:
         metrics_results['Double Centuries'] = int(len(df[df['Runs'] >= 200]))
     if "Boundaries (4s + 6s)" in selected_metrics:
@@ -148,41 +135,37 @@ for player, file in files.items():
             metrics_results['Peak Year'] = f"{peak_year} (Runs: {peak_runs}, Avg: {peak_avg})"
 
     all_results[player] = metrics_results
-
-# assign scores and calculate rankings
-player_scores = {}
-for player, metrics in all_results.items():
-    total_score = 0
-    scores = {}
-
-    scored_metrics = [m for m in selected_metrics if m != "Peak Year"]
-
-    for metric_name, value in metrics.items():
-        if metric_name == "Peak Year":
-            continue  # deal with peak year separately
-        if metric_name in ["Batting Average", "First Innings Average", "Second Innings Average", "Third Innings Average", "Fourth Innings Average"]:
-            score = normalize_batting_avg(value)
-        else:
-            # Filter only numeric values from the metrics
-            numeric_values = [v for v in metrics.values() if isinstance(v, (int, float))]
-            max_val = MAX_VALUES.get(metric_name, max(numeric_values))  # Use only numeric values
-            score = normalize(value, max_val)
-        total_score += score
-        scores[metric_name + " (Score)"] = score
-
+    innings_counts[player] = len(df)
+
+# assign scores as percentiles of every batter in D24_CLEAN.csv and the merged innings tables,
+# metrics only the innings tables have are too few batters to rank against and are left out
+population_arrays = percentile_arrays(build_population())
+metrics_table = pd.DataFrame.from_dict(all_results, orient='index')
+no_innings = [innings_counts[player] == 0 for player in metrics_table.index]
+scores, final_scores = score_columns(metrics_table, selected_metrics, population_arrays, no_innings)
+for player in all_results:
     # Store the normalized scores
-    all_results[player].update(scores)
+    all_results[player].update(scores.loc[player].dropna().to_dict())
+player_scores = final_scores.to_dict()
 
-    # Calculate the final score by averaging the normalized scores
-    player_scores[player] = round(total_score / len(scored_metrics), 2)
+unscored = unscored_metrics(selected_metrics, population_arrays)
+if unscored:
+    print(f"\nNot Scored, only the Fab4 have innings data to rank against: {', '.join(unscored)}. "
+          "Shown in the detailed stats but left out of the final score.")
 
 # rank players
 ranked_players = sorted(player_scores.items(), key=lambda x: x[1], reverse=True)
 
 # display rankings
-print("\nRankings Based on Selected Metrics:")
-for rank, (player, score) in enumerate(ranked_players, start=1):
-    print(f"{rank}. {player} - Final Score: {score}/10")
+if final_scores.isna().all():
+    ranked_players = list(player_scores.items())
+    scorable = [str(i) for i, metric in enumerate(metrics_list, 1)
+                if metric != "Peak Year" and not unscored_metrics([metric], population_arrays)]
+    print(f"\nNone of the Selected Metrics can be Scored, Choose at least one of Metrics {', '.join(scorable)} for a Ranking.")
+else:
+    print("\nRankings Based on Selected Metrics:")
+    for rank, (player, score) in enumerate(ranked_players, start=1):
+        print(f"{rank}. {player} - Final Score: {score}/10")
 
 # yes no prompt
 def get_yes_no(prompt):
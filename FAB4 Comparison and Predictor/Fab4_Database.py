@@ -0,0 +1,61 @@
+# imports
+import os
+import sqlite3
+import pandas as pd
+from Fab4_Build_Manifest import file_hash
+from Fab4_Paths import PLAYER_NAMES, files
+
+# optional local database of the merged innings tables, built by Fab4_PreProcessing.py --sqlite
+DB_PATH = "CLEANED_DATA/FAB4.db"
+
+# merged innings tables loaded into the database
+innings_files = list(files.values())
+
+def build_database(path=DB_PATH):
+    "Loads the merged innings tables into a fresh database with indexes on player, opposition, year and home/away."
+    if os.path.exists(f"{path}.tmp"):
+        os.remove(f"{path}.tmp")
+    with sqlite3.connect(f"{path}.tmp") as conn:
+        innings = pd.concat([pd.read_csv(file) for file in innings_files], ignore_index=True)
+        innings.to_sql("innings", conn, index=False)
+        # player first, the comparison always filters on one player
+        conn.execute('CREATE INDEX ix_innings_player ON innings (PlayerName, "Home/Away", Year)')
+        conn.execute('CREATE INDEX ix_innings_player_opposition ON innings (PlayerName, Opposition, Year)')
+        conn.execute("CREATE INDEX ix_innings_opposition ON innings (Opposition, Year)")
+        conn.execute("CREATE INDEX ix_innings_year ON innings (Year)")
+
+        # hashes of the csvs the database was built from, so a stale database is never used
+        conn.execute("CREATE TABLE meta (path TEXT PRIMARY KEY, hash TEXT)")
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [(source, file_hash(source)) for source in innings_files])
+    conn.close()
+    os.replace(f"{path}.tmp", path)
+    print(f"✅ Saved SQLite database to {path}")
+
+def open_database(path=DB_PATH):
+    "Connection to the database if it exists and matches the merged csvs, otherwise None."
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path)
+    recorded = dict(conn.execute("SELECT path, hash FROM meta").fetchall())
+    if any(recorded.get(source) != file_hash(source) for source in innings_files):
+        conn.close()
+        return None
+    return conn
+
+def innings_query(conn, player, columns, home_away=None, start_year=None, end_year=None, opposition=None):
+    "Selected columns of one player's innings matching the comparison filters, as indexed SQL."
+    clauses, params = ["PlayerName = ?"], [PLAYER_NAMES.get(player, player)]
+    if home_away is not None:
+        clauses.append('"Home/Away" = ?')
+        params.append(home_away)
+    if start_year is not None:
+        clauses.append("Year BETWEEN ? AND ?")
+        params += [start_year, end_year]
+    if opposition:
+        # same substring match as the pandas filter, on rows the player index has already narrowed
+        clauses.append("Opposition LIKE ?")
+        params.append(f"%{opposition}%")
+
+    select = ", ".join(f'"{column}"' for column in columns)
+    sql = f"SELECT {select} FROM innings WHERE {' AND '.join(clauses)}"
+    return pd.read_sql_query(sql, conn, params=params)
@@ -0,0 +1,43 @@
+# imports
+import pandas as pd
+
+# rolling windows in innings
+FORM_WINDOWS = (5, 10)
+
+# the innings tables have no not-out flag, so a streak counts consecutive innings of at least this many runs
+STREAK_RUNS = 10
+
+# recent-form model inputs
+FORM_FEATURES = [f"Last{window}{stat}" for window in FORM_WINDOWS for stat in ("Average", "StrikeRate")] + ["FormStreak"]
+
+def add_form_features(df, player_column="PlayerName"):
+    "Adds rolling form over each player's previous innings, the table must be in chronological order."
+    players = df[player_column]
+    # shift first so an innings never sees its own runs
+    previous = df[["Runs", "BallsFaced"]].groupby(players, sort=False).shift(1)
+    grouped = previous.groupby(players, sort=False)
+
+    form = {}
+    for window in FORM_WINDOWS:
+        # one grouped rolling pass per window covers both runs and balls
+        totals = grouped.rolling(window, min_periods=1).sum().reset_index(level=0, drop=True)
+        counts = grouped["Runs"].rolling(window, min_periods=1).count().reset_index(level=0, drop=True)
+        form[f"Last{window}Average"] = totals["Runs"] / counts
+        form[f"Last{window}StrikeRate"] = totals["Runs"] / totals["BallsFaced"].where(totals["BallsFaced"] > 0) * 100
+
+    # consecutive previous innings reaching STREAK_RUNS, reset by every innings that falls short
+    reached = previous["Runs"] >= STREAK_RUNS
+    spell = (~reached).groupby(players, sort=False).cumsum()
+    form["FormStreak"] = reached.groupby([players, spell], sort=False).cumsum()
+
+    # a first innings has no history
+    form = pd.DataFrame(form).reindex(df.index).fillna(0)
+    return df.assign(**{feature: form[feature].round(2) for feature in FORM_FEATURES})
+
+def current_form(df, player_column="PlayerName"):
+    "Form going into each player's next innings, one row per player."
+    # a placeholder innings after the last one picks up the form from the whole history
+    next_innings = df.groupby(player_column, sort=False).tail(1)
+    with_next = pd.concat([df, next_innings], ignore_index=True)
+    form = add_form_features(with_next, player_column).iloc[len(df):]
+    return form.set_index(player_column)[FORM_FEATURES]
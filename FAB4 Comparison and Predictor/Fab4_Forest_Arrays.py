@@ -0,0 +1,158 @@
+# imports
+import os
+import joblib
+import numpy as np
+
+# store models
+model_dir = "MODELS/"
+
+def export_forest(model):
+    "Flattens a fitted tree forest into concatenated node arrays, one root offset per tree."
+    estimators = getattr(model, "estimators_", None)
+    if estimators is None or not all(hasattr(tree, "tree_") for tree in estimators):
+        raise ValueError(f"Only tree forests can be exported, got {type(model).__name__}")
+
+    feature, threshold, left, right, value, roots = [], [], [], [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        # leaves point to themselves so every tree can be walked for the same number of levels
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+        value.append(tree.value[:, 0, 0])
+        roots.append(offset)
+        offset += tree.node_count
+
+    return {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "value": np.concatenate(value).astype(np.float64),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "max_depth": np.int32(max(estimator.tree_.max_depth for estimator in estimators)),
+        "feature_names": np.asarray(getattr(model, "feature_names_in_", []), dtype=str),
+    }
+
+# rows walked together, keeps the (tree, row) node matrix cache sized
+CHUNK_ROWS = 2048
+
+def child_table(arrays):
+    "Interleaved [left, right] children so one gather picks the next node."
+    return np.stack([arrays["left"], arrays["right"]], axis=1).ravel()
+
+def predict_forest(arrays, X, children=None):
+    "Scores a batch by walking every tree one level at a time and averaging the leaf values."
+    # sklearn compares float32 inputs against the float64 thresholds
+    X = np.asarray(X, dtype=np.float32)
+    if X.ndim == 1:
+        X = X.reshape(1, -1)
+    if children is None:
+        children = child_table(arrays)
+
+    feature, threshold, value = arrays["feature"], arrays["threshold"], arrays["value"]
+    roots, max_depth = arrays["roots"], int(arrays["max_depth"])
+
+    predictions = np.empty(len(X))
+    for start in range(0, len(X), CHUNK_ROWS):
+        chunk = X[start:start + CHUNK_ROWS]
+        flat = chunk.ravel()
+        row_offsets = np.arange(len(chunk)) * chunk.shape[1]
+
+        # current node of every (tree, row) pair
+        nodes = np.repeat(roots[:, None], len(chunk), axis=1)
+        for _ in range(max_depth):
+            go_right = flat[row_offsets + feature[nodes]] > threshold[nodes]
+            nodes = children[2 * nodes + go_right]
+
+        predictions[start:start + CHUNK_ROWS] = value[nodes].mean(axis=0)
+    return predictions
+
+class ForestArrays:
+    "Array-backed stand-in for a fitted forest, only provides predict."
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.children = child_table(arrays)
+        self.feature_names = list(arrays["feature_names"])
+
+    def predict(self, X):
+        # put dataframe columns in training order
+        if hasattr(X, "columns") and self.feature_names:
+            X = X[self.feature_names]
+        return predict_forest(self.arrays, X, self.children)
+
+class OppositionEncoder:
+    "Array-backed stand-in for the fitted opposition LabelEncoder."
+
+    def __init__(self, classes):
+        self.classes_ = classes
+
+    def transform(self, values):
+        values = np.asarray(values)
+        encoded = np.searchsorted(self.classes_, values)
+        encoded = np.minimum(encoded, len(self.classes_) - 1)
+        unseen = self.classes_[encoded] != values
+        if unseen.any():
+            raise ValueError(f"y contains previously unseen labels: {values[unseen].tolist()}")
+        return encoded
+
+def forest_path(player_name):
+    return f"{model_dir}{player_name}_forest.npz"
+
+def save_forest_arrays(player_name, model, label_encoder):
+    "Saves a player's forest and opposition classes as plain arrays."
+    classes = np.asarray(label_encoder.classes_, dtype=str)
+    path = forest_path(player_name)
+    # write then rename so a running predictor never loads a half-written file
+    with open(f"{path}.tmp", "wb") as f:
+        np.savez(f, classes=classes, **export_forest(model))
+    os.replace(f"{path}.tmp", path)
+
+def load_player_model(player_name):
+    "Returns (model, label_encoder), array-backed when exported so sklearn is not needed."
+    path = forest_path(player_name)
+    if os.path.exists(path):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files}
+        classes = arrays.pop("classes")
+        return ForestArrays(arrays), OppositionEncoder(classes)
+
+    model = joblib.load(f"{model_dir}{player_name}_model.pkl")
+    label_encoder = joblib.load(f"{model_dir}{player_name}_label_encoder.pkl")
+    return model, label_encoder
+
+
+if __name__ == "__main__":
+    import time
+    from Fab4_Model_Train import prepare_player_data
+    from Fab4_Paths import files
+
+    # export every saved forest and check it against sklearn
+    for player_name, file_path in files.items():
+        model = joblib.load(f"{model_dir}{player_name}_model.pkl")
+        label_encoder = joblib.load(f"{model_dir}{player_name}_label_encoder.pkl")
+        save_forest_arrays(player_name, model, label_encoder)
+
+        forest, encoder = load_player_model(player_name)
+        X, y, _ = prepare_player_data(file_path)
+        max_diff = np.abs(forest.predict(X) - model.predict(X)).max()
+
+        # single row latency
+        row = X.iloc[:1]
+        start = time.perf_counter()
+        for _ in range(100):
+            model.predict(row)
+        sklearn_ms = (time.perf_counter() - start) * 10
+        start = time.perf_counter()
+        for _ in range(100):
+            forest.predict(row)
+        arrays_ms = (time.perf_counter() - start) * 10
+
+        print(f"Exported {player_name} - max difference: {max_diff:.2e}, "
+              f"1 row predict: sklearn {sklearn_ms:.2f} ms, arrays {arrays_ms:.2f} ms")
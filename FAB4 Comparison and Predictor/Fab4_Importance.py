@@ -0,0 +1,102 @@
+# imports
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from joblib import Memory, Parallel, delayed
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import train_test_split
+from Fab4_Build_Manifest import code_hash, file_hash
+from Fab4_Model_Train import TRAINING_CODE, model_dir, prepare_player_data
+from Fab4_Paths import files
+
+# cached importances and reports
+memory = Memory("CACHE/", verbose=0)
+report_dir = "REPORTS/"
+
+# joblib only tracks the cached function's own source, so the feature and permutation code is hashed into the key
+IMPORTANCE_CODE = TRAINING_CODE + ["Fab4_Importance.py"]
+
+def permuted_mae(model, X, y, column, seed):
+    "MAE after shuffling one column of the test rows."
+    X_permuted = X.copy()
+    X_permuted[:, column] = np.random.default_rng(seed).permutation(X_permuted[:, column])
+    return mean_absolute_error(y, model.predict(X_permuted))
+
+def permutation_importances(model, X, y, n_repeats=10, n_jobs=-1, seed=42):
+    "Mean and std of the MAE increase when each feature is shuffled, repeats run in parallel across cores."
+    # the unshuffled baseline is predicted once and shared by every feature and repeat
+    baseline_mae = mean_absolute_error(y, model.predict(X))
+    tasks = [(column, seed + repeat) for column in range(X.shape[1]) for repeat in range(n_repeats)]
+    maes = Parallel(n_jobs=n_jobs)(delayed(permuted_mae)(model, X, y, column, task_seed) for column, task_seed in tasks)
+    increases = np.array(maes).reshape(X.shape[1], n_repeats) - baseline_mae
+    return increases.mean(axis=1), increases.std(axis=1)
+
+@memory.cache
+def player_importances(player_name, model_hash, data_hash, importance_code_hash, n_repeats):
+    "Impurity and permutation importances of a player's saved model, cached per model, data and code version."
+    model = joblib.load(f"{model_dir}{player_name}_model.pkl")
+    X, y, label_encoder = prepare_player_data(files[player_name])
+    # same held-out rows the model was evaluated on
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # models without impurity importances (gradient boosting) only get permutation scores
+    impurity = getattr(model, "feature_importances_", np.full(X.shape[1], np.nan))
+    mean, std = permutation_importances(model, X_test.to_numpy(dtype=float), y_test.to_numpy(), n_repeats)
+
+    return pd.DataFrame({
+        "Player": player_name,
+        "Feature": X.columns,
+        "Impurity": np.round(impurity, 4),
+        "PermutationMAE": np.round(mean, 3),
+        "PermutationStd": np.round(std, 3),
+    })
+
+def importance_report(n_repeats=10):
+    "Importances for every saved player model, nothing is retrained."
+    importance_code_hash = code_hash(IMPORTANCE_CODE)
+    tables = []
+    for player_name, file_path in files.items():
+        model_path = f"{model_dir}{player_name}_model.pkl"
+        if not os.path.exists(model_path):
+            print(f"No saved model for {player_name}, run Fab4_Model_Train.py first.")
+            continue
+        tables.append(player_importances(player_name, file_hash(model_path), file_hash(file_path),
+                                         importance_code_hash, n_repeats))
+    return pd.concat(tables, ignore_index=True)
+
+def plot_importances(report):
+    "Saves one bar chart of permutation importances per player."
+    for player_name, table in report.groupby("Player"):
+        table = table.sort_values("PermutationMAE")
+        plt.figure(figsize=(10, 6))
+        plt.barh(table["Feature"], table["PermutationMAE"], xerr=table["PermutationStd"])
+        plt.title(f"Permutation Importance - {player_name}")
+        plt.xlabel("Increase in MAE (runs)")
+        plt.tight_layout()
+        plt.savefig(f"{report_dir}importance_{player_name.replace(' ', '_')}.png")
+        plt.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Feature importances of the saved Fab4 innings models.")
+    parser.add_argument("--repeats", type=int, default=10, help="shuffles per feature")
+    parser.add_argument("--charts", action="store_true", help="save a chart per player to REPORTS/")
+    args = parser.parse_args()
+
+    report = importance_report(args.repeats)
+
+    # save the full table
+    os.makedirs(report_dir, exist_ok=True)
+    output_file = f"{report_dir}importance.csv"
+    report.to_csv(output_file, index=False)
+
+    print("\nPERMUTATION IMPORTANCE (increase in MAE when the feature is shuffled)")
+    print(report.pivot(index="Feature", columns="Player", values="PermutationMAE").to_string())
+    print("\nIMPURITY IMPORTANCE")
+    print(report.pivot(index="Feature", columns="Player", values="Impurity").to_string())
+    if args.charts:
+        plot_importances(report)
+    print(f"\n✅ Saved importances to {output_file}")
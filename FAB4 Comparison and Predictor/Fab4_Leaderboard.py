@@ -0,0 +1,135 @@
+# imports
+import time
+import numpy as np
+import pandas as pd
+from Fab4_Paths import files
+from Fab4_Scoring import innings_metrics, percentile_arrays, score_columns, unscored_metrics
+
+# career totals for every test batter, the merged innings tables come from Fab4_Paths
+population_file = "CLEANED_DATA/D24_CLEAN.csv"
+
+# country codes used in D24 for the nationalities in the merged tables
+COUNTRY_CODES = {"India": "IND", "England": "ENG", "Australia": "AUS", "New Zealand": "NZ"}
+
+# metrics the career totals can provide, the rest need innings tables
+CAREER_METRICS = ["Total Runs", "Batting Average", "Fifty Plus Scores", "Half Centuries", "Centuries"]
+INNINGS_METRICS = CAREER_METRICS + [
+    "Strike Rate", "First Innings Average", "Second Innings Average", "Third Innings Average",
+    "Fourth Innings Average", "Double Centuries", "Boundaries (4s + 6s)"
+]
+
+def build_population(population_file=population_file, innings_files=files.values()):
+    "One metrics row per batter, with the metrics only innings tables have joined on for the players they cover."
+    careers = pd.read_csv(population_file)
+    population = pd.DataFrame({
+        "PlayerName": careers["PlayerName"],
+        "Country": careers["Country"],
+        "Innings": careers["Innings"],
+        "Total Runs": careers["Runs"],
+        # same definition as the comparison, runs per innings
+        "Batting Average": (careers["Runs"] / careers["Innings"]).round(2),
+        "Fifty Plus Scores": careers["Centuries"] + careers["HalfCenturies"],
+        "Half Centuries": careers["HalfCenturies"],
+        "Centuries": careers["Centuries"],
+    })
+
+    innings = pd.concat([pd.read_csv(file) for file in innings_files], ignore_index=True)
+    detailed = innings_metrics(innings)
+    countries = innings.groupby("PlayerName")["Nationality"].first().map(COUNTRY_CODES)
+    detailed = detailed.assign(Country=countries).reset_index()
+
+    # the merged tables hold only part of each career, so the career totals stay from D24
+    innings_only = [metric for metric in INNINGS_METRICS if metric not in CAREER_METRICS]
+    return population.merge(detailed[["PlayerName", "Country"] + innings_only], on=["PlayerName", "Country"], how="left")
+
+def top_k(population, metrics, k=10, country=None, min_innings=0, arrays=None):
+    "Scores every batter with the selected metrics and returns the k best without sorting the whole table."
+    # percentiles are always against the whole population, whatever the filters
+    if arrays is None:
+        arrays = percentile_arrays(population)
+    eligible = population["Innings"] >= min_innings
+    if country:
+        eligible &= population["Country"].str.upper() == country.upper()
+    # batters missing a scored metric cannot be ranked on it, unscored metrics are only shown
+    scored_metrics = [metric for metric in metrics if metric != "Peak Year"]
+    ranked_metrics = [metric for metric in scored_metrics if metric not in unscored_metrics(scored_metrics, arrays)]
+    eligible &= population[ranked_metrics].notna().all(axis=1)
+    candidates = population[eligible]
+
+    scores, final = score_columns(candidates, scored_metrics, arrays)
+    values = final.to_numpy()
+    k = min(k, len(values))
+    if k == 0:
+        return candidates.iloc[:0].assign(**{"Final Score": []})
+
+    # partial selection of the k best, then sort just those
+    best = np.argpartition(-values, k - 1)[:k]
+    best = best[np.argsort(-values[best], kind="stable")]
+
+    leaderboard = candidates.iloc[best][["PlayerName", "Country", "Innings"] + scored_metrics]
+    leaderboard = pd.concat([leaderboard, scores.iloc[best]], axis=1).assign(**{"Final Score": values[best]})
+    return leaderboard.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    population = build_population()
+    arrays = percentile_arrays(population)
+    print(f"Loaded {len(population)} batters.")
+
+    print("Choose the Metrics to Rank by (comma-separated):")
+    for i, metric in enumerate(INNINGS_METRICS, 1):
+        print(f"{i}. {metric}")
+    print(f"Metrics {len(CAREER_METRICS) + 1}-{len(INNINGS_METRICS)} are only available for players with merged innings data "
+          "and are shown but not scored.")
+
+    # check valid input
+    while True:
+        selected_input = input("Enter Metric Numbers: ").split(',')
+        try:
+            selected_metrics = []
+            for choice in selected_input:
+                choice = choice.strip()
+                if not choice.isdigit():
+                    raise ValueError("Non-Numeric Input Detected.")
+                idx = int(choice)
+                if idx < 1 or idx > len(INNINGS_METRICS):
+                    raise ValueError(f"Choice {idx} is Out of Valid Range.")
+                selected_metrics.append(INNINGS_METRICS[idx - 1])
+            break
+        except ValueError as ve:
+            print(f"Invalid Input: {ve}. Please Enter Valid Numbers from the List.")
+
+    while True:
+        try:
+            k = int(input("How Many Players to Show? "))
+            if k > 0:
+                break
+            print("Please Enter a Positive Number.")
+        except ValueError:
+            print("Invalid Input. Please Enter a Number.")
+
+    country = input("Filter by Country Code (e.g. IND, leave blank for all): ").strip() or None
+
+    while True:
+        try:
+            min_innings = int(input("Minimum Innings (0 for none): ") or 0)
+            if min_innings >= 0:
+                break
+            print("Please Enter 0 or More.")
+        except ValueError:
+            print("Invalid Input. Please Enter a Number.")
+
+    # metrics only the merged innings tables have cannot be ranked against the population
+    unscored = unscored_metrics(selected_metrics, arrays)
+    if unscored:
+        print(f"Not Scored, only the Fab4 have innings data to rank against: {', '.join(unscored)}.")
+    if len(unscored) == len(selected_metrics):
+        raise SystemExit(f"Choose at least one of Metrics 1-{len(CAREER_METRICS)} for a Ranking.")
+
+    start = time.perf_counter()
+    leaderboard = top_k(population, selected_metrics, k, country, min_innings, arrays)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    print(f"\nTop {len(leaderboard)} Based on Selected Metrics ({elapsed:.1f} ms):")
+    for rank, row in enumerate(leaderboard.itertuples(index=False), start=1):
+        print(f"{rank}. {row.PlayerName} ({row.Country}) - Final Score: {row[-1]}/10")
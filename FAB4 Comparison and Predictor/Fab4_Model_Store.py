@@ -0,0 +1,106 @@
+# imports
+import threading
+from Fab4_Build_Manifest import BuildManifest, file_hash
+from Fab4_Forest_Arrays import load_player_model, model_dir
+from Fab4_Paths import files
+
+def model_version(player_name, data_hash):
+    "Identifies the saved model and the merged data it serves, changes whenever either does."
+    return f"{(file_hash(f'{model_dir}{player_name}_model.pkl') or '')[:12]}-{(data_hash or '')[:12]}"
+
+class ModelStore:
+    "Serves the current model for each player and retrains in the background when the cleaned data changes."
+
+    def __init__(self, backend=None, poll_seconds=30):
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # cleaned data the loaded models are serving
+        self._data_hashes = {}
+        # player -> (model, label_encoder, version), replaced as a whole so readers never see a half-updated map
+        self._models = {}
+        # models load in the background so the prompts can show straight away
+        self._load_error = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._load_all, daemon=True).start()
+
+    def _load(self, player_name):
+        return (*load_player_model(player_name), model_version(player_name, self._data_hashes[player_name]))
+
+    def _load_all(self):
+        try:
+            # only the saved models are loaded here, scikit-learn is imported if a retrain is needed
+            self._data_hashes = {player_name: file_hash(file_path) for player_name, file_path in files.items()}
+            self._models = {player_name: self._load(player_name) for player_name in files}
+        except Exception as error:
+            self._load_error = error
+        finally:
+            self._ready.set()
+
+    def wait_until_ready(self):
+        "Blocks until the first models are loaded, only the first prediction ever has to wait."
+        if not self._ready.is_set():
+            print("Waiting for the models to finish loading...")
+            self._ready.wait()
+        if self._load_error is not None:
+            raise RuntimeError(f"Models could not be loaded: {self._load_error}")
+
+    def current(self, player_name):
+        "Returns the (model, label_encoder) pair to use for one prediction."
+        return self.current_version(player_name)[:2]
+
+    def current_version(self, player_name):
+        "Returns the (model, label_encoder, version) triple, the version changes whenever the model is retrained."
+        self.wait_until_ready()
+        return self._models[player_name]
+
+    def versions(self):
+        "Versions of every model being served."
+        self.wait_until_ready()
+        return {version for model, label_encoder, version in self._models.values()}
+
+    def refresh(self):
+        "Rebuilds models whose merged data changed since they were loaded and swaps them in, returns the players updated."
+        updated = []
+        with self._refresh_lock:
+            for player_name, file_path in files.items():
+                data_hash = file_hash(file_path)
+                if data_hash == self._data_hashes[player_name]:
+                    continue
+                # scikit-learn is only imported once some data has actually changed
+                from Fab4_Backends import DEFAULT_BACKEND
+                from Fab4_Model_Train import train_if_changed
+                # same backend the model was last trained with, unless the store was given one
+                backend = self.backend or BuildManifest().params(f"train:{player_name}").get("backend", DEFAULT_BACKEND)
+                # retrains unless another run already built a model for this data
+                train_if_changed(player_name, file_path, backend)
+                self._data_hashes[player_name] = data_hash
+                # predictions already holding the old pair finish on it, new ones get the new model
+                self._models = {**self._models, player_name: self._load(player_name)}
+                updated.append(player_name)
+        return updated
+
+    def start(self):
+        "Starts the background thread that watches the cleaned data."
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        self._ready.wait()
+        while self._load_error is None:
+            try:
+                for player_name in self.refresh():
+                    print(f"\n[Model for {player_name} retrained on new data]")
+            except Exception as error:
+                # keep serving the current models, try again on the next poll
+                print(f"\n[Background retraining failed: {error}]")
+            if self._stop.wait(self.poll_seconds):
+                break
@@ -1,57 +1,109 @@
 # imports
+import argparse
 import pandas as pd
 import joblib
 import os
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import mean_absolute_error, r2_score
 from sklearn.preprocessing import LabelEncoder
-
-# file paths
-files = {
-    "Joe Root": "CLEANED_DATA/JE_ROOT_MERGED.csv",
-    "Kane Williamson": "CLEANED_DATA/KS_WILLIAMSON_MERGED.csv",
-    "Steve Smith": "CLEANED_DATA/SPD_SMITH_MERGED.csv",
-    "Virat Kohli": "CLEANED_DATA/V_KOHLI_MERGED.csv",
-}
+from Fab4_Backends import BACKENDS, DEFAULT_BACKEND, make_model
+from Fab4_Build_Manifest import BuildManifest
+from Fab4_Features import FORM_FEATURES, add_form_features
+from Fab4_Forest_Arrays import forest_path, save_forest_arrays
+from Fab4_Paths import files
 
 # store models
 model_dir = "MODELS/"
 os.makedirs(model_dir, exist_ok=True)
 
-def train_and_save_models():
-    "Trains RandomForest models for each player and saves them."
-    for player_name, file_path in files.items():
+# code the feature matrices and models are built from
+TRAINING_CODE = ["Fab4_Model_Train.py", "Fab4_Backends.py", "Fab4_Features.py"]
+
+# model inputs, recent form comes from the innings before each one
+FEATURES = ["Year", "Opposition", "Home/Away", "BallsFaced", "StrikeRate", "MatchInning"] + FORM_FEATURES
+
+def prepare_player_data(file_path):
+    "Loads a merged innings file and returns the encoded features, target and opposition encoder."
+
+    df = add_form_features(pd.read_csv(file_path))
+
+    # encode oppositions
+    label_encoder = LabelEncoder()
+    df["Opposition"] = label_encoder.fit_transform(df["Opposition"])
+
+    # define features and target
+    X = df[FEATURES]
+    y = df["Runs"]
 
-        df = pd.read_csv(file_path)
+    return X, y, label_encoder
 
-        # encode oppositions
-        label_encoder = LabelEncoder()
-        df["Opposition"] = label_encoder.fit_transform(df["Opposition"])
+def save_atomically(obj, path):
+    "Writes a pickle next to its target and renames it, so readers never load a half-written file."
+    joblib.dump(obj, f"{path}.tmp")
+    os.replace(f"{path}.tmp", path)
 
-        # save the encoder to decode later
-        joblib.dump(label_encoder, f"{model_dir}{player_name}_label_encoder.pkl")
+def train_player_model(player_name, file_path, backend=DEFAULT_BACKEND):
+    "Trains and saves the model and encoder for one player, returns the model with its test MAE and R²."
 
-        # define features and target
-        X = df[["Year", "Opposition", "Home/Away", "BallsFaced", "StrikeRate", "MatchInning"]]
-        y = df["Runs"]
+    X, y, label_encoder = prepare_player_data(file_path)
 
-        # train-test split
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    # save the encoder to decode later
+    save_atomically(label_encoder, f"{model_dir}{player_name}_label_encoder.pkl")
 
-        # train model
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
+    # train-test split
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-        # save the model
-        joblib.dump(model, f"{model_dir}{player_name}_model.pkl")
+    # train model
+    model = make_model(backend)
+    model.fit(X_train, y_train)
 
-        # model evaluation
-        y_pred = model.predict(X_test)
-        mae = mean_absolute_error(y_test, y_pred)
-        r2 = r2_score(y_test, y_pred)
+    # save the model, forests are also exported as plain arrays for sklearn-free inference
+    save_atomically(model, f"{model_dir}{player_name}_model.pkl")
+    if hasattr(model, "estimators_"):
+        save_forest_arrays(player_name, model, label_encoder)
+    elif os.path.exists(forest_path(player_name)):
+        os.remove(forest_path(player_name))
+
+    # model evaluation
+    y_pred = model.predict(X_test)
+    mae = mean_absolute_error(y_test, y_pred)
+    r2 = r2_score(y_test, y_pred)
+
+    return model, mae, r2
+
+def model_artefacts(player_name, backend=DEFAULT_BACKEND):
+    "Files written by training one player's model."
+    artefacts = [f"{model_dir}{player_name}_model.pkl", f"{model_dir}{player_name}_label_encoder.pkl"]
+    if backend != "hist_gradient_boosting":
+        artefacts.append(forest_path(player_name))
+    return artefacts
+
+def train_if_changed(player_name, file_path, backend=DEFAULT_BACKEND, force=False):
+    "Retrains one player's model unless its data, code and backend are unchanged, returns (MAE, R²) or None if skipped."
+    manifest = BuildManifest()
+    code = TRAINING_CODE
+    step = f"train:{player_name}"
+    outputs = model_artefacts(player_name, backend)
+    if not force and manifest.is_current(step, [file_path], outputs, code, {"backend": backend}):
+        return None
+    model, mae, r2 = train_player_model(player_name, file_path, backend)
+    manifest.record(step, [file_path], outputs, code, {"backend": backend})
+    return mae, r2
+
+def train_and_save_models(backend=DEFAULT_BACKEND, force=False):
+    "Trains a model of the chosen backend for each player whose data, code or backend changed."
+    for player_name, file_path in files.items():
+        scores = train_if_changed(player_name, file_path, backend, force)
+        if scores is None:
+            print(f"Model up to date for {player_name}")
+        else:
+            print(f"Model trained for {player_name} - MAE: {scores[0]:.2f}, R²: {scores[1]:.2f}")
 
-        print(f"Model trained for {player_name} - MAE: {mae:.2f}, R²: {r2:.2f}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the Fab4 innings models.")
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--force", action="store_true", help="retrain even if nothing changed")
+    args = parser.parse_args()
 
-# run to train and save models
-train_and_save_models()
\ No newline at end of file
+    # run to train and save models
+    train_and_save_models(args.backend, args.force)
@@ -0,0 +1,16 @@
+# merged innings table for each player, shared by every script so a new player is added in one place
+# kept free of scikit-learn so the predictor can import it without the training modules
+files = {
+    "Joe Root": "CLEANED_DATA/JE_ROOT_MERGED.csv",
+    "Kane Williamson": "CLEANED_DATA/KS_WILLIAMSON_MERGED.csv",
+    "Steve Smith": "CLEANED_DATA/SPD_SMITH_MERGED.csv",
+    "Virat Kohli": "CLEANED_DATA/V_KOHLI_MERGED.csv",
+}
+
+# PlayerName of each player in the merged tables and D24_CLEAN.csv
+PLAYER_NAMES = {
+    "Joe Root": "JE Root",
+    "Kane Williamson": "KS Williamson",
+    "Steve Smith": "SPD Smith",
+    "Virat Kohli": "V Kohli",
+}
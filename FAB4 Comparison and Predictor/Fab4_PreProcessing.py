@@ -1,5 +1,9 @@
 # imports
+import argparse
+import bisect
 import pandas as pd
+from Fab4_Build_Manifest import BuildManifest
+from Fab4_Database import build_database
 
 # file paths
 file_paths = {
@@ -13,53 +17,54 @@ file_paths = {
 int_columns = ["runs", "minutes", "balls", "fours", "sixes", "year", "inns"]
 float_columns = ["strike_rate"]
 
-# load clean merge function
-def merge_home_away(player_name, file_list, home_nation):
-    # Load home and away CSVs
-    df_home = pd.read_csv(file_list[0])
-    df_away = pd.read_csv(file_list[1])
+# cleaned output for a player
+def merged_path(player_name):
+    return f"CLEANED_DATA/{player_name.replace(' ', '_').upper()}_MERGED.csv"
+
+# rename columns
+column_rename = {
+    "player": "PlayerName",
+    "runs": "Runs",
+    "mins": "Minutes",
+    "bf": "BallsFaced",
+    "4s": "Fours",
+    "6s": "Sixes",
+    "sr": "StrikeRate",
+    "inns": "MatchInning",
+    "opposition": "Opposition",
+    "ground": "Ground",
+    "year": "Year",
+    "venue": "Venue",
+    "home_away": "Home/Away"
+}
+
+# merged tables are kept sorted by these columns
+sort_columns = ["Year", "Opposition", "Home/Away", "Ground", "MatchInning"]
 
+# clean raw innings rows, home_away is read from the Venue column when not given
+def clean_innings(df, home_nation, home_away=None):
     # drop unnamed column
-    for df in [df_home, df_away]:
-        if "Unnamed: 0" in df.columns:
-            df.drop(columns=["Unnamed: 0"], inplace=True)
+    if "Unnamed: 0" in df.columns:
+        df = df.drop(columns=["Unnamed: 0"])
 
     # standardize column name
-    for df in [df_home, df_away]:
-        df.columns = df.columns.str.strip().str.replace(" ", "_").str.lower()
-
-    # rename columns
-    column_rename = {
-        "player": "PlayerName",
-        "runs": "Runs",
-        "mins": "Minutes",
-        "bf": "BallsFaced",
-        "4s": "Fours",
-        "6s": "Sixes",
-        "sr": "StrikeRate",
-        "inns": "MatchInning",
-        "opposition": "Opposition",
-        "ground": "Ground",
-        "year": "Year",
-        "venue": "Venue",
-        "home_away": "Home/Away"
-    }
+    df.columns = df.columns.str.strip().str.replace(" ", "_").str.lower()
 
     # apply renaming
-    df_home.rename(columns=column_rename, inplace=True)
-    df_away.rename(columns=column_rename, inplace=True)
+    df = df.rename(columns=column_rename)
 
     # add home and away as boolean
-    df_home["Home/Away"] = 1
-    df_away["Home/Away"] = 0
+    if home_away is None:
+        df["Home/Away"] = (df["Venue"].str.strip().str.lower() == "home").astype(int)
+    else:
+        df["Home/Away"] = home_away
 
     # add nationality
-    df_home["Nationality"] = home_nation
-    df_away["Nationality"] = home_nation
-
-    # merge home and away
-    merged_df = pd.concat([df_home, df_away], ignore_index=True)
+    df["Nationality"] = home_nation
+    return df
 
+# convert types and tidy team names
+def convert_columns(merged_df):
     # check data types
     for col in int_columns:
         if col in merged_df.columns:
@@ -73,10 +78,14 @@ def merge_home_away(player_name, file_list, home_nation):
     if "Opposition" in merged_df.columns:
         merged_df["Opposition"] = merged_df["Opposition"].str.lower().str.strip()
 
-    # handle missing balls faced and minutes
+# handle missing balls faced and minutes, only rows in `rows` are filled and every row is used as a reference
+def impute_missing(merged_df, rows=None):
     for col in ["Minutes", "BallsFaced"]:
         if col in merged_df.columns:
+            merged_df[col] = merged_df[col].astype(float) # medians can be fractional
             mask = (merged_df[col] == 0) | (merged_df[col].isna())
+            if rows is not None:
+                mask &= merged_df.index.isin(rows)
             for idx in merged_df[mask].index:
                 run_value = merged_df.at[idx, "Runs"]
                 similar_rows = merged_df[merged_df["Runs"] == run_value][col]
@@ -88,19 +97,95 @@ def merge_home_away(player_name, file_list, home_nation):
 
                 merged_df.at[idx, col] = nearest_value if not pd.isna(nearest_value) else 0
 
+# load clean merge function
+def merge_home_away(player_name, file_list, home_nation):
+    # Load home and away CSVs
+    df_home = clean_innings(pd.read_csv(file_list[0]), home_nation, home_away=1)
+    df_away = clean_innings(pd.read_csv(file_list[1]), home_nation, home_away=0)
+
+    # merge home and away
+    merged_df = pd.concat([df_home, df_away], ignore_index=True)
+
+    convert_columns(merged_df)
+    impute_missing(merged_df)
+
     merged_df.drop(columns=["Venue"], inplace=True)
 
     # sort data
     merged_df = merged_df.sort_values(
-        by=["Year", "Opposition", "Home/Away", "Ground", "MatchInning"],
+        by=sort_columns,
         ascending=[True, True, True, True, True]
     ).reset_index(drop=True)
 
     # save
-    output_file = f"CLEANED_DATA/{player_name.replace(' ', '_').upper()}_MERGED.csv"
+    output_file = merged_path(player_name)
     merged_df.to_csv(output_file, index=False)
     print(f"✅ Saved cleaned & sorted data for {player_name}")
 
+# line ending used by an existing file, so appended lines match it
+def line_ending(path):
+    with open(path, "rb") as f:
+        return "\r\n" if f.readline().endswith(b"\r\n") else "\n"
+
+# merge new innings into the sorted merged table, only the file from the first new row onwards is rewritten
+def append_innings(player_name, new_file, home_nation):
+    output_file = merged_path(player_name)
+    existing = pd.read_csv(output_file)
+    new_rows = clean_innings(pd.read_csv(new_file), home_nation)
+    if new_rows.empty:
+        print(f"No innings to append in {new_file}, {output_file} is unchanged")
+        return 0
+
+    # clean the new rows with the same rules, using the existing innings as reference for missing values
+    combined = pd.concat([existing, new_rows], ignore_index=True)
+    new_index = combined.index[len(existing):]
+    convert_columns(combined)
+    impute_missing(combined, new_index)
+    new_rows = combined.loc[new_index, existing.columns].sort_values(by=sort_columns, kind="stable")
+
+    # sorted-insert positions, new rows go after existing innings with the same key like a stable sort
+    keys = list(zip(*(existing[col] for col in sort_columns)))
+    positions = [bisect.bisect_right(keys, key) for key in zip(*(new_rows[col] for col in sort_columns))]
+    first = positions[0]
+
+    newline = line_ending(output_file)
+    new_lines = new_rows.to_csv(header=False, index=False, lineterminator=newline).splitlines(keepends=True)
+
+    with open(output_file, "r+", newline="") as f:
+        # skip the header and the unchanged rows, then keep the rest of the file as it is
+        for _ in range(first + 1):
+            f.readline()
+        offset = f.tell()
+        tail = f.read().splitlines(keepends=True)
+        if tail and not tail[-1].endswith(newline):
+            tail[-1] += newline
+
+        merged_tail, previous = [], first
+        for position, line in zip(positions, new_lines):
+            merged_tail.extend(tail[previous - first:position - first])
+            merged_tail.append(line)
+            previous = position
+        merged_tail.extend(tail[previous - first:])
+
+        f.seek(offset)
+        f.truncate()
+        f.write("".join(merged_tail))
+
+    print(f"✅ Appended {len(new_rows)} innings for {player_name}, rewrote {len(merged_tail)} of {len(existing) + len(new_rows)} rows")
+    return len(new_rows)
+
+# keep the raw home and away files in step so a full rebuild gives the same table
+def append_raw_rows(new_file, file_list):
+    new_raw = pd.read_csv(new_file)
+    venue = new_raw[new_raw.columns[new_raw.columns.str.strip().str.lower() == "venue"][0]].str.strip().str.lower()
+    for raw_file, venue_name in zip(file_list, ["home", "away"]):
+        rows = new_raw[venue == venue_name]
+        if rows.empty:
+            continue
+        columns = pd.read_csv(raw_file, nrows=0).columns
+        rows.reindex(columns=columns).to_csv(raw_file, mode="a", header=False, index=False,
+                                             lineterminator=line_ending(raw_file))
+
 # define each player
 players_home_nation = {
     "V Kohli": "India",
@@ -109,8 +194,44 @@ players_home_nation = {
     "KS Williamson": "New Zealand"
 }
 
+parser = argparse.ArgumentParser(description="Clean and merge the Fab4 home and away innings.")
+parser.add_argument("--force", action="store_true", help="rebuild even if inputs are unchanged")
+parser.add_argument("--append", nargs=2, metavar=("PLAYER", "FILE"),
+                    help="merge new innings from FILE (raw format with a Venue column) into PLAYER's table")
+parser.add_argument("--sqlite", action="store_true", help="also load the merged innings tables into CLEANED_DATA/FAB4.db")
+args = parser.parse_args()
+
+manifest = BuildManifest()
+code = ["Fab4_PreProcessing.py"]
+
+if args.append:
+    player_name, new_file = args.append
+    player = next((name for name in file_paths if name.lower() == player_name.strip().lower()), None)
+    if player is None:
+        raise SystemExit(f"Unknown player {player_name}, choose from: {', '.join(file_paths)}")
+    files, home_nation = file_paths[player], players_home_nation[player]
+    if not append_innings(player, new_file, home_nation):
+        raise SystemExit
+    append_raw_rows(new_file, files)
+    # raw files and merged table now agree, so the next full run skips this player
+    manifest.record(f"merge:{player}", files, [merged_path(player)], code, {"home_nation": home_nation})
+    if args.sqlite:
+        build_database()
+    raise SystemExit
+
+# only rebuild players whose raw files or this script changed
 for player, files in file_paths.items():
     home_nation = players_home_nation[player]
+    step = f"merge:{player}"
+    outputs = [merged_path(player)]
+    if not args.force and manifest.is_current(step, files, outputs, code, {"home_nation": home_nation}):
+        print(f"Up to date: {player}")
+        continue
     merge_home_away(player, files, home_nation)
+    manifest.record(step, files, outputs, code, {"home_nation": home_nation})
+
+print("\n✅ All 4 merged player files are up to date!")
 
-print("\n✅ All 4 merged player files have been saved successfully!")
\ No newline at end of file
+# optional indexed copy of the cleaned tables
+if args.sqlite:
+    build_database()
\ No newline at end of file
@@ -1,14 +1,24 @@
 # imports
-import joblib
+import argparse
 import pandas as pd
+from Fab4_Features import FORM_FEATURES, current_form
+from Fab4_Model_Store import ModelStore
+from Fab4_Prediction_Cache import PredictionCache
+from Fab4_Simulator import simulate_series
+from Fab4_What_If import save_what_if, what_if_matrix
+from Fab4_Paths import files
 
-# file paths
-files = {
-    "Joe Root": "CLEANED_DATA/JE_ROOT_MERGED.csv",
-    "Kane Williamson": "CLEANED_DATA/KS_WILLIAMSON_MERGED.csv",
-    "Steve Smith": "CLEANED_DATA/SPD_SMITH_MERGED.csv",
-    "Virat Kohli": "CLEANED_DATA/V_KOHLI_MERGED.csv",
-}
+parser = argparse.ArgumentParser(description="Predict a Fab4 player's runs in a series.")
+parser.add_argument("--matrix", action="store_true",
+                    help="predict every player, opposition, home/away and series length and save REPORTS/what_if.csv")
+parser.add_argument("--heatmap", action="store_true", help="with --matrix, also save a heatmap per player")
+args = parser.parse_args()
+
+# models load in the background while the first question is answered, and are retrained when the cleaned data changes
+store = ModelStore().start()
+
+# repeated queries are answered from the cache until the player's model is retrained
+cache = PredictionCache()
 
 # calculate avg balls faced and strike rate
 def get_player_averages(player_name, opposition):
@@ -31,39 +41,45 @@ def get_player_averages(player_name, opposition):
     return avg_balls, avg_sr
 
 
-def load_model_and_predict(player_name, opposition, home_or_away, num_matches):
-
-    model_path = f"MODELS/{player_name}_model.pkl"
-    encoder_path = f"MODELS/{player_name}_label_encoder.pkl"
+def load_model_and_predict(player_name, opposition, home_or_away, num_matches, model=None, label_encoder=None):
 
-    # load model and encoder
-    model = joblib.load(model_path)
-    label_encoder = joblib.load(encoder_path)
+    # current model and encoder from the store unless passed in
+    if model is None or label_encoder is None:
+        model, label_encoder = store.current(player_name)
 
     opposition_encoded = label_encoder.transform([opposition])[0]
 
     avg_balls, avg_sr = get_player_averages(player_name, opposition)
-
-    # predict for future series
-    total_predicted_runs = 0
-    for match in range(num_matches):
-        for innings in [1, 2]:
-            new_data = pd.DataFrame({
-                "Year": [2025],
-                "Opposition": [opposition_encoded],
-                "Home/Away": [home_or_away],
-                "BallsFaced": [avg_balls],
-                "StrikeRate": [avg_sr],
-                "MatchInning": [innings]
-            })
-            predicted_runs = model.predict(new_data)[0]
-            total_predicted_runs += predicted_runs
-            total_predicted_runs = int(round(total_predicted_runs))
-            opposition = opposition.upper()
-
-    print(f"\n{player_name} - Predicted Runs vs {opposition} ({'Home' if home_or_away else 'Away'}) in {num_matches} matches: {total_predicted_runs}")
+    form = current_form(pd.read_csv(files[player_name])).iloc[0]
+
+    # predict for future series, every innings scored in one batch
+    innings = [1, 2] * num_matches
+    new_data = pd.DataFrame({
+        "Year": [2025] * len(innings),
+        "Opposition": [opposition_encoded] * len(innings),
+        "Home/Away": [home_or_away] * len(innings),
+        "BallsFaced": [avg_balls] * len(innings),
+        "StrikeRate": [avg_sr] * len(innings),
+        "MatchInning": innings,
+        **{feature: [form[feature]] * len(innings) for feature in FORM_FEATURES}
+    })
+    total_predicted_runs = int(round(model.predict(new_data).sum()))
+
+    print_prediction(player_name, opposition, home_or_away, num_matches, total_predicted_runs)
     return total_predicted_runs
 
+def print_prediction(player_name, opposition, home_or_away, num_matches, total_predicted_runs, cached=False):
+    opposition = opposition.upper()
+    print(f"\n{player_name} - Predicted Runs vs {opposition} ({'Home' if home_or_away else 'Away'}) in {num_matches} matches: {total_predicted_runs}"
+          + (" (cached)" if cached else ""))
+
+# what-if matrix instead of the prompts, one predict call per player's model
+if args.matrix:
+    grid = what_if_matrix({player_name: store.current(player_name) for player_name in files})
+    output_file = save_what_if(grid, args.heatmap)
+    print(f"✅ Saved {len(grid)} predictions to {output_file}")
+    raise SystemExit
+
 # user input with validations
 # list of players
 available_players = {
@@ -127,7 +143,32 @@ while True:
         except ValueError:
             print("Invalid Input. Please Enter a Valid Number.")
 
-    load_model_and_predict(player_name, opposition, home_or_away, num_matches)
+    # one model version for the whole prediction, even if a retrain lands meanwhile
+    model, label_encoder, version = store.current_version(player_name)
+
+    key = cache.key(version, player_name, opposition, home_or_away, num_matches)
+    total_predicted_runs = cache.get(key)
+    if total_predicted_runs is None:
+        total_predicted_runs = load_model_and_predict(player_name, opposition, home_or_away, num_matches, model, label_encoder)
+        cache.put(key, total_predicted_runs)
+    else:
+        print_prediction(player_name, opposition, home_or_away, num_matches, total_predicted_runs, cached=True)
+
+    # simulate the series for a range of outcomes
+    while True:
+        simulate = input("Do You Want to Simulate the Series for a Range of Outcomes? (yes/no): ").strip().lower()
+        if simulate in ["yes", "no"]:
+            break
+        else:
+            print("Please Enter 'yes' or 'no'.")
+    if simulate == "yes":
+        results = simulate_series(player_name, opposition, home_or_away, num_matches,
+                                  model=model, label_encoder=label_encoder)
+        p10, p50, p90 = results["quantiles"].values()
+        print(f"\nSimulated Series ({len(results['series_runs'])} simulations):")
+        print(f"Mean Runs: {results['mean']:.0f}")
+        print(f"P10 / P50 / P90: {p10:.0f} / {p50:.0f} / {p90:.0f}")
+        print(f"Chance of a Century in the Series: {results['p_century']:.1%}")
 
     while True:
         # ask if want to predict again
@@ -137,5 +178,8 @@ while True:
         else:
             print("Please Enter 'yes' or 'no'.")
     if again == "no":
+        print(f"Prediction Cache Hit Rate: {cache.hit_rate:.0%} ({cache.hits} of {cache.hits + cache.misses} predictions)")
+        cache.drop_stale(store.versions())
+        cache.close()
         print("Exiting FAB4 Predictor")
         break
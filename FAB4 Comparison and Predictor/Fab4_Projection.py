@@ -0,0 +1,107 @@
+# imports
+import argparse
+import os
+import numpy as np
+import pandas as pd
+from Fab4_Features import FORM_FEATURES, current_form
+from Fab4_Forest_Arrays import load_player_model
+from Fab4_Paths import files
+
+# projection tables
+report_dir = "REPORTS/"
+
+# columns of a fixture list, one row per series
+FIXTURE_COLUMNS = ["Player", "Year", "Opposition", "Home/Away", "Matches"]
+
+def season_schedule(df, year):
+    "Series a player played in one year, as (Opposition, Home/Away, Matches) with one match per ground."
+    season = df[df["Year"] == year].drop_duplicates(["Opposition", "Home/Away", "Ground"])
+    return season.groupby(["Opposition", "Home/Away"]).size().rename("Matches").reset_index()
+
+def default_fixtures(from_year, to_year, schedule_year=None):
+    "Repeats each player's schedule from schedule_year (their last season by default) every year up to to_year."
+    fixtures = []
+    for player_name, file_path in files.items():
+        df = pd.read_csv(file_path)
+        schedule = season_schedule(df, schedule_year or df["Year"].max())
+        for year in range(from_year, to_year + 1):
+            fixtures.append(schedule.assign(Player=player_name, Year=year))
+    return pd.concat(fixtures, ignore_index=True)[FIXTURE_COLUMNS]
+
+def load_fixtures(path, to_year):
+    "Reads a fixture CSV with Player, Year, Opposition, Home/Away and Matches columns."
+    fixtures = pd.read_csv(path)
+    fixtures["Opposition"] = fixtures["Opposition"].str.lower().str.strip()
+    return fixtures[fixtures["Year"] <= to_year][FIXTURE_COLUMNS]
+
+def innings_matrix(fixtures, df, label_encoder):
+    "Every innings of every fixture for one player as a single feature matrix, two innings per match."
+    innings = fixtures.loc[fixtures.index.repeat(fixtures["Matches"] * 2)].reset_index(drop=True)
+    # every fixture expands to an even number of rows, so innings simply alternate 1, 2
+    innings["MatchInning"] = np.arange(len(innings)) % 2 + 1
+
+    # same inputs as the series predictor: averages vs the opposition, or the whole career if never played
+    by_opposition = df.groupby("Opposition")[["BallsFaced", "StrikeRate"]].mean()
+    averages = by_opposition.reindex(innings["Opposition"]).fillna(df[["BallsFaced", "StrikeRate"]].mean())
+    form = current_form(df).iloc[0]
+
+    return pd.DataFrame({
+        "Year": innings["Year"].to_numpy(),
+        "Opposition": label_encoder.transform(innings["Opposition"].to_numpy()),
+        "Home/Away": innings["Home/Away"].to_numpy(),
+        "BallsFaced": averages["BallsFaced"].to_numpy(),
+        "StrikeRate": averages["StrikeRate"].to_numpy(),
+        "MatchInning": innings["MatchInning"].to_numpy(),
+        **{feature: form[feature] for feature in FORM_FEATURES},
+    })
+
+def project_careers(fixtures):
+    "Projected runs per player per year and the cumulative career total, one batched predict per player."
+    rows = []
+    for player_name, file_path in files.items():
+        df = pd.read_csv(file_path)
+        model, label_encoder = load_player_model(player_name)
+        player_fixtures = fixtures[fixtures["Player"] == player_name]
+
+        # oppositions the model was never trained on cannot be encoded
+        known = player_fixtures["Opposition"].isin(label_encoder.classes_)
+        for opposition in player_fixtures.loc[~known, "Opposition"].unique():
+            print(f"Skipping {player_name} vs {opposition.title()}, no innings against them to learn from.")
+        player_fixtures = player_fixtures[known]
+        if player_fixtures.empty:
+            continue
+
+        X = innings_matrix(player_fixtures, df, label_encoder)
+        runs = pd.Series(model.predict(X), index=X["Year"]).groupby(level=0).sum()
+        years = pd.DataFrame({"Player": player_name, "Year": runs.index, "ProjectedRuns": runs.round().astype(int).to_numpy()})
+        years["CumulativeRuns"] = years["ProjectedRuns"].cumsum()
+        years["CareerRuns"] = int(df["Runs"].sum()) + years["CumulativeRuns"]
+        rows.append(years)
+    return pd.concat(rows, ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Project the Fab4 careers year by year from a fixture list.")
+    parser.add_argument("--to-year", type=int, required=True, help="last year to project")
+    parser.add_argument("--from-year", type=int, default=None, help="first year to project, the year after the data ends by default")
+    parser.add_argument("--fixtures", default=None, help="CSV with Player, Year, Opposition, Home/Away, Matches")
+    parser.add_argument("--schedule-year", type=int, default=None,
+                        help="without a fixture list, repeat the series played in this year (each player's last season by default)")
+    args = parser.parse_args()
+
+    from_year = args.from_year or max(pd.read_csv(path, usecols=["Year"])["Year"].max() for path in files.values()) + 1
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures, args.to_year)
+    else:
+        fixtures = default_fixtures(from_year, args.to_year, args.schedule_year)
+
+    projection = project_careers(fixtures)
+
+    # save the full table
+    os.makedirs(report_dir, exist_ok=True)
+    output_file = f"{report_dir}projection.csv"
+    projection.to_csv(output_file, index=False)
+
+    print("\nPROJECTED CAREER RUNS AT THE END OF EACH YEAR")
+    print(projection.pivot(index="Year", columns="Player", values="CareerRuns").to_string())
+    print(f"\n✅ Saved projection to {output_file}")
@@ -0,0 +1,85 @@
+# imports
+import numpy as np
+import pandas as pd
+
+# metrics that get a score, peak year is reported but not scored
+SCORED_METRICS = [
+    "Total Runs", "Batting Average", "Strike Rate", "First Innings Average",
+    "Second Innings Average", "Third Innings Average", "Fourth Innings Average",
+    "Fifty Plus Scores", "Half Centuries", "Centuries", "Double Centuries",
+    "Boundaries (4s + 6s)"
+]
+
+# fewest batters a metric needs in the population before a percentile against them is scored
+MIN_POPULATION = 20
+
+def innings_metrics(innings_df):
+    "Every scored metric for each player in an innings table, one row per PlayerName."
+    runs = innings_df["Runs"]
+    frame = innings_df.assign(
+        Fifty=runs >= 50,
+        Half=(runs >= 50) & (runs < 100),
+        # every hundred, the same definition as the D24 centuries the scores are ranked against
+        Hundred=runs >= 100,
+        Double=runs >= 200,
+        Boundaries=innings_df["Fours"] + innings_df["Sixes"],
+    )
+    grouped = frame.groupby("PlayerName")
+    totals = grouped[["Runs", "BallsFaced", "Boundaries"]].sum()
+    counts = grouped[["Fifty", "Half", "Hundred", "Double"]].sum()
+    innings = grouped["MatchInning"].count()
+
+    metrics = pd.DataFrame({
+        "Innings": innings,
+        "Total Runs": totals["Runs"].astype(int),
+        "Batting Average": (totals["Runs"] / innings).round(2),
+        "Strike Rate": (totals["Runs"] / totals["BallsFaced"] * 100).round(2),
+        "Fifty Plus Scores": counts["Fifty"].astype(int),
+        "Half Centuries": counts["Half"].astype(int),
+        "Centuries": counts["Hundred"].astype(int),
+        "Double Centuries": counts["Double"].astype(int),
+        "Boundaries (4s + 6s)": totals["Boundaries"].astype(int),
+    })
+    by_inning = frame.pivot_table(index="PlayerName", columns="MatchInning", values="Runs", aggfunc="mean")
+    for i, inning in enumerate(["First", "Second", "Third", "Fourth"], 1):
+        metrics[f"{inning} Innings Average"] = by_inning.get(float(i), pd.Series(dtype=float)).round(2)
+    return metrics.fillna(0)
+
+def percentile_arrays(population):
+    "Sorted values of every scored metric across the population, built once and shared by every score."
+    return {metric: np.sort(population[metric].dropna().to_numpy(dtype=float))
+            for metric in SCORED_METRICS if metric in population.columns}
+
+def percentile_score(values, sorted_values):
+    "Mid-rank share of the population below each value, out of 10, so a value shared by many batters lands in the middle of the tie."
+    if len(sorted_values) == 0:
+        return np.zeros(len(values))
+    below = np.searchsorted(sorted_values, values, side="left")
+    at_or_below = np.searchsorted(sorted_values, values, side="right")
+    return 10 * (below + at_or_below) / 2 / len(sorted_values)
+
+def unscored_metrics(metrics, arrays):
+    "Selected metrics with too few batters in the population to rank against, e.g. the ones only the merged innings tables have."
+    return [metric for metric in metrics
+            if metric in SCORED_METRICS and len(arrays.get(metric, ())) < MIN_POPULATION]
+
+def score_columns(metrics_df, metrics, arrays, empty=None):
+    "Scores every row of a metrics table against the population percentiles, returns the per-metric scores and the final score out of 10."
+    scored_metrics = [metric for metric in metrics if metric != "Peak Year"]
+    unscored = unscored_metrics(scored_metrics, arrays)
+    scores = pd.DataFrame(index=metrics_df.index)
+    for metric in scored_metrics:
+        if metric in unscored:
+            # a percentile among a handful of batters only takes a few coarse steps, so these stay empty
+            scores[f"{metric} (Score)"] = np.nan
+            continue
+        values = metrics_df[metric].to_numpy(dtype=float)
+        scores[f"{metric} (Score)"] = np.round(percentile_score(values, arrays[metric]), 2)
+
+    # final score over the metrics that could be scored, empty when none could
+    ranked = [f"{metric} (Score)" for metric in scored_metrics if metric not in unscored]
+    # rows without any innings behind them, e.g. a filter that matches nothing, have nothing to score
+    if empty is not None:
+        scores.loc[np.asarray(empty, dtype=bool), ranked] = 0
+    final = scores[ranked].to_numpy().mean(axis=1) if ranked else np.full(len(scores), np.nan)
+    return scores, pd.Series(np.round(final, 2), index=metrics_df.index, name="Final Score")
@@ -0,0 +1,67 @@
+# imports
+import numpy as np
+import pandas as pd
+from Fab4_Features import current_form
+from Fab4_Forest_Arrays import load_player_model
+from Fab4_Paths import files
+
+# quantiles reported for each simulated series
+SERIES_QUANTILES = (0.1, 0.5, 0.9)
+
+# innings inputs from the player's history against an opposition
+def get_player_innings(player_name, opposition):
+    "Returns the empirical (BallsFaced, StrikeRate) pairs vs an opposition, or the whole career if none."
+
+    if player_name not in files:
+        raise ValueError(f"Invalid player name: {player_name}")
+
+    df = pd.read_csv(files[player_name])
+
+    # filter for opposition
+    opposition_data = df[df["Opposition"] == opposition]
+    if opposition_data.empty:
+        opposition_data = df
+
+    return opposition_data[["BallsFaced", "StrikeRate"]].to_numpy(dtype=float)
+
+
+def simulate_series(player_name, opposition, home_or_away, num_matches, n_sims=10000, seed=None,
+                    model=None, label_encoder=None):
+    "Simulates n_sims series by resampling past innings and returns the distribution of series runs."
+
+    # load model and encoder if not passed in
+    if model is None or label_encoder is None:
+        model, label_encoder = load_player_model(player_name)
+
+    opposition_encoded = label_encoder.transform([opposition])[0]
+    samples = get_player_innings(player_name, opposition)
+    n_samples = len(samples)
+    # form going into the series, the same for every simulated innings
+    form = current_form(pd.read_csv(files[player_name])).iloc[0]
+
+    # every simulated innings is one of the empirical innings played as match inning 1 or 2,
+    # so score each (sample, inning) pair once in a single batched predict
+    candidates = pd.DataFrame({
+        "Year": 2025,
+        "Opposition": opposition_encoded,
+        "Home/Away": home_or_away,
+        "BallsFaced": np.tile(samples[:, 0], 2),
+        "StrikeRate": np.tile(samples[:, 1], 2),
+        "MatchInning": np.repeat([1, 2], n_samples),
+        **form.to_dict(),
+    })
+    candidate_runs = model.predict(candidates).reshape(2, n_samples)
+
+    # draw an empirical innings for every slot of every simulated series
+    rng = np.random.default_rng(seed)
+    innings_slots = np.tile([0, 1], num_matches)
+    draws = rng.integers(0, n_samples, size=(n_sims, len(innings_slots)))
+    innings_runs = candidate_runs[innings_slots, draws]
+    series_runs = innings_runs.sum(axis=1)
+
+    return {
+        "mean": float(series_runs.mean()),
+        "quantiles": dict(zip(SERIES_QUANTILES, np.quantile(series_runs, SERIES_QUANTILES))),
+        "p_century": float((innings_runs >= 100).any(axis=1).mean()),
+        "series_runs": series_runs,
+    }
@@ -0,0 +1,75 @@
+# imports
+import os
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from Fab4_Features import FORM_FEATURES, current_form
+from Fab4_Forest_Arrays import load_player_model
+from Fab4_Paths import files
+
+# what-if tables and charts
+report_dir = "REPORTS/"
+
+# series lengths covered by the grid, same range as the predictor
+MATCH_COUNTS = range(1, 6)
+
+def player_grid(player_name, model, label_encoder):
+    "Predicted series runs for every opposition, home/away and series length, from one predict call."
+    df = pd.read_csv(files[player_name])
+    oppositions = np.asarray(label_encoder.classes_)
+
+    # per-opposition inputs computed once for the player, career averages where there is no history
+    averages = df.groupby("Opposition")[["BallsFaced", "StrikeRate"]].mean().reindex(oppositions)
+    averages = averages.fillna(df[["BallsFaced", "StrikeRate"]].mean())
+    form = current_form(df).iloc[0]
+
+    # a series is match innings 1 and 2 repeated, so only each (opposition, home/away, inning) row is scored
+    opposition_idx, home_or_away, match_inning = (grid.ravel() for grid in np.meshgrid(
+        np.arange(len(oppositions)), [0, 1], [1, 2], indexing="ij"))
+    X = pd.DataFrame({
+        "Year": 2025,
+        "Opposition": label_encoder.transform(oppositions[opposition_idx]),
+        "Home/Away": home_or_away,
+        "BallsFaced": averages["BallsFaced"].to_numpy()[opposition_idx],
+        "StrikeRate": averages["StrikeRate"].to_numpy()[opposition_idx],
+        "MatchInning": match_inning,
+        **{feature: form[feature] for feature in FORM_FEATURES},
+    })
+    per_match = model.predict(X).reshape(len(oppositions), 2, 2).sum(axis=2)
+
+    matches = np.array(MATCH_COUNTS)
+    runs = per_match[:, :, None] * matches
+    index = pd.MultiIndex.from_product([oppositions, [0, 1], matches], names=["Opposition", "Home/Away", "Matches"])
+    return pd.DataFrame({"Player": player_name, "PredictedRuns": np.round(runs.ravel()).astype(int)}, index=index).reset_index()
+
+def what_if_matrix(models=None):
+    "Grid for every player, models is {player: (model, label_encoder)} and defaults to the saved models."
+    grids = []
+    for player_name in files:
+        model, label_encoder = models[player_name] if models else load_player_model(player_name)
+        grids.append(player_grid(player_name, model, label_encoder))
+    return pd.concat(grids, ignore_index=True)[["Player", "Opposition", "Home/Away", "Matches", "PredictedRuns"]]
+
+def save_what_if(grid, heatmaps=False):
+    "Writes the pivot table and optionally one heatmap per player, returns the table path."
+    os.makedirs(report_dir, exist_ok=True)
+    pivot = grid.pivot_table(index=["Player", "Opposition"], columns=["Home/Away", "Matches"], values="PredictedRuns", aggfunc="first")
+    pivot = pivot.rename(columns={0: "Away", 1: "Home"}, level="Home/Away")
+    output_file = f"{report_dir}what_if.csv"
+    pivot.to_csv(output_file)
+
+    if heatmaps:
+        for player_name, table in grid[grid["Matches"] == 1].groupby("Player"):
+            per_match = table.pivot(index="Opposition", columns="Home/Away", values="PredictedRuns")
+            plt.figure(figsize=(6, max(4, 0.4 * len(per_match))))
+            plt.imshow(per_match.to_numpy(), cmap="YlGn", aspect="auto")
+            plt.colorbar(label="Predicted Runs per Match")
+            plt.xticks([0, 1], ["Away", "Home"])
+            plt.yticks(range(len(per_match)), [team.title() for team in per_match.index])
+            for (row, col), runs in np.ndenumerate(per_match.to_numpy()):
+                plt.text(col, row, runs, ha="center", va="center")
+            plt.title(f"Predicted Runs per Match - {player_name}")
+            plt.tight_layout()
+            plt.savefig(f"{report_dir}what_if_{player_name.replace(' ', '_')}.png")
+            plt.close()
+    return output_file
@@ -0,0 +1,85 @@
+#imports
+import io
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
+from sklearn.metrics import r2_score, mean_absolute_error
+
+#available estimators
+BACKENDS = ['random_forest', 'hist_gradient_boosting', 'shallow_forest']
+DEFAULT_BACKEND = 'random_forest'
+
+#batch sizes timed in the report
+BATCH_SIZES = [1, 100, 100000]
+
+#build an unfitted estimator for a backend, params override the defaults
+def make_model(backend=DEFAULT_BACKEND, params=None):
+    params = params or {}
+    if backend == 'random_forest':
+        return RandomForestRegressor(**{'n_estimators': 100, 'random_state': 42, **params})
+    if backend == 'hist_gradient_boosting':
+        return HistGradientBoostingRegressor(**{'random_state': 42, **params})
+    if backend == 'shallow_forest':
+        #fewer trees with a capped number of leaves, small pickle and cheap predict
+        return RandomForestRegressor(**{'n_estimators': 50, 'max_leaf_nodes': 64, 'random_state': 42, **params})
+    raise ValueError(f"Invalid backend: {backend}. Choose from {BACKENDS}")
+
+#rows per second for one predict call on a batch of n rows
+def predict_throughput(model, X, n_rows, repeats=5):
+    batch = X.iloc[np.resize(np.arange(len(X)), n_rows)]
+    timings = []
+    for _ in range(repeats if n_rows < 10000 else 1):
+        start = time.perf_counter()
+        model.predict(batch)
+        timings.append(time.perf_counter() - start)
+    return n_rows / min(timings)
+
+#fit every backend on the same split and compare cost and accuracy
+def compare_backends(X_train, X_test, y_train, y_test, target_scaler=None, backends=BACKENDS):
+    y_train = np.asarray(y_train).ravel()
+    y_test = np.asarray(y_test).ravel()
+    rows = []
+    for backend in backends:
+        model = make_model(backend)
+
+        start = time.perf_counter()
+        model.fit(X_train, y_train)
+        fit_time = time.perf_counter() - start
+
+        #accuracy in actual runs
+        y_pred = model.predict(X_test)
+        y_true = y_test
+        if target_scaler is not None:
+            y_pred = target_scaler.inverse_transform(y_pred.reshape(-1, 1)).ravel()
+            y_true = target_scaler.inverse_transform(y_test.reshape(-1, 1)).ravel()
+
+        #size of the pickled artefact
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+
+        row = {
+            'Backend': backend,
+            'FitSeconds': round(fit_time, 3),
+            'SizeKB': round(buffer.tell() / 1024, 1),
+            'R2': round(r2_score(y_true, y_pred), 4),
+            'MAE': round(mean_absolute_error(y_true, y_pred), 2),
+        }
+        for n_rows in BATCH_SIZES:
+            row[f'RowsPerSec@{n_rows}'] = int(predict_throughput(model, X_test, n_rows))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    from Predictor_Data import load_datasets, prepare_training_data, split_training_data
+
+    #same split as Predictor_Model.py
+    d19, d24 = load_datasets()
+    X, y, scaler_features, scaler_target = prepare_training_data(d19)
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
+
+    report = compare_backends(X_train, X_test, y_train, y_test, target_scaler=scaler_target)
+    print("\nBACKEND SPEED / ACCURACY REPORT")
+    print(report.to_string(index=False))
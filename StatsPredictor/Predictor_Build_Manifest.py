@@ -0,0 +1,56 @@
+#imports
+import hashlib
+import json
+import os
+
+#build state, one entry per step
+MANIFEST_PATH = 'BUILD_MANIFEST.json'
+
+#sha-256 of a file's contents, None if it does not exist
+def file_hash(path):
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+#combined hash of several source files, for cache keys that must change whenever the code does
+def code_hash(paths):
+    return hashlib.sha256('|'.join(file_hash(path) or '' for path in paths).encode()).hexdigest()
+
+#records the content hashes each step was built from so unchanged steps can be skipped
+class BuildManifest:
+
+    def __init__(self, path=MANIFEST_PATH):
+        self.path = path
+        self.steps = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.steps = json.load(f)
+
+    def signature(self, inputs, code, params):
+        return {
+            'inputs': {path: file_hash(path) for path in inputs},
+            'code': {path: file_hash(path) for path in code},
+            'params': params,
+        }
+
+    #true when the inputs, code and params match the last build and its outputs are untouched
+    def is_current(self, step, inputs, outputs, code, params=None):
+        recorded = self.steps.get(step)
+        if recorded is None:
+            return False
+        if recorded['signature'] != self.signature(inputs, code, params or {}):
+            return False
+        return all(file_hash(path) == recorded['outputs'].get(path) for path in outputs)
+
+    #saves the hashes of a step that has just been built
+    def record(self, step, inputs, outputs, code, params=None):
+        self.steps[step] = {
+            'signature': self.signature(inputs, code, params or {}),
+            'outputs': {path: file_hash(path) for path in outputs},
+        }
+        with open(self.path, 'w') as f:
+            json.dump(self.steps, f, indent=4)
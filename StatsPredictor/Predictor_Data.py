@@ -0,0 +1,81 @@
+#imports
+import json
+import os
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.model_selection import train_test_split
+
+#columns to scale
+num_features = ['Matches', 'Innings', 'NotOut', 'HighestScore', 'Ducks',
+            'Centuries', 'HalfCenturies', 'Average', 'FirstMatch',
+            'LastMatch', 'CenturyConversion', 'FiftyPlusScorePercentage',
+            'DuckPercentage', 'NotOutPercentage', 'CareerLength',
+            'MatchesPerYear', 'CurrentPlayer']
+
+target_column = ['Runs']
+
+#saved artefacts
+model_dir = 'MODELS/'
+tuned_params_path = f'{model_dir}tuned_params.json'
+
+#load datasets
+def load_datasets():
+    d19 = pd.read_csv('CLEANED_DATA/D19_CLEAN.csv') #data until 2019
+    d24 = pd.read_csv('CLEANED_DATA/D24_CLEAN.csv') #data until 2024
+    return d19, d24
+
+#whole-number career columns, kept as integers in the career table
+int_columns = ['Matches', 'Innings', 'NotOut', 'Runs', 'HighestScore', 'Centuries',
+               'HalfCenturies', 'Ducks', 'FirstMatch', 'LastMatch', 'CareerLength', 'CurrentPlayer']
+
+#unified career table indexed by player id, and a lower-case name to id lookup
+def load_careers():
+    dtypes = {f'{col}_{snapshot}': 'Int64' for col in int_columns for snapshot in ('19', '24')}
+    careers = pd.read_csv('CLEANED_DATA/CAREERS.csv', index_col='PlayerID', dtype=dtypes)
+
+    #a name shared by several players resolves to the one with the most runs
+    latest_runs = careers['Runs_24'].fillna(careers['Runs_19'])
+    by_runs = latest_runs.sort_values(ascending=False, kind='stable').index
+    name_index = {}
+    for player_id, name in careers.loc[by_runs, 'PlayerName'].str.lower().items():
+        name_index.setdefault(name, player_id)
+
+    return careers, name_index
+
+#one snapshot's stats for a career row, None if the player is not in that snapshot
+def snapshot_stats(career, snapshot):
+    suffix = f'_{snapshot}'
+    if pd.isna(career[f'Innings{suffix}']):
+        return None
+    return {col[:-len(suffix)]: career[col] for col in career.index if col.endswith(suffix)}
+
+#encode and scale d19 into model features and target
+def prepare_training_data(d19):
+    #one-hot encoding for countries
+    d19_encoded = pd.get_dummies(d19, columns=['Country'], drop_first=True)
+
+    #apply scaling
+    scaler_features = MinMaxScaler()
+    scaler_target = MinMaxScaler()
+    d19_encoded[num_features] = scaler_features.fit_transform(d19_encoded[num_features])
+    d19_encoded[target_column] = scaler_target.fit_transform(d19_encoded[target_column])
+
+    #drop player name to train model on only numerical values
+    d19_encoded = d19_encoded.drop(columns=['PlayerName'])
+
+    #define features (X) and target (y)
+    X = d19_encoded.drop(columns=target_column)  #all features minus runs
+    y = d19_encoded[target_column]  #target = runs
+
+    return X, y, scaler_features, scaler_target
+
+#split data in train and test sets, 80 - 20 ratio
+def split_training_data(X, y):
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+#hyperparameters saved by Predictor_Tuning.py, empty if tuning has not been run
+def load_tuned_params():
+    if not os.path.exists(tuned_params_path):
+        return {}
+    with open(tuned_params_path) as f:
+        return json.load(f)['params']
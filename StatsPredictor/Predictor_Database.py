@@ -0,0 +1,92 @@
+#imports
+import os
+import sqlite3
+import pandas as pd
+from Predictor_Build_Manifest import file_hash
+from Predictor_Data import int_columns
+
+#optional local database of the cleaned tables, built by Predictor_PreProcessing.py --sqlite
+DB_PATH = 'CLEANED_DATA/STATS.db'
+
+#cleaned tables loaded into the database
+source_files = {
+    'careers': 'CLEANED_DATA/CAREERS.csv',
+    'd19': 'CLEANED_DATA/D19_CLEAN.csv',
+    'd24': 'CLEANED_DATA/D24_CLEAN.csv',
+}
+
+#indexes for the lookups and filters people run most
+indexes = {
+    'careers': ['NameKey', 'Country', 'Centuries_24', 'CurrentPlayer_24', 'LastMatch_24'],
+    'd19': ['PlayerName', 'Country', 'Centuries', 'LastMatch'],
+    'd24': ['PlayerName', 'Country', 'Centuries', 'LastMatch'],
+}
+
+#load the cleaned tables into a fresh database, written then renamed so readers never see a half-built file
+def build_database(path=DB_PATH):
+    if os.path.exists(f'{path}.tmp'):
+        os.remove(f'{path}.tmp')
+    with sqlite3.connect(f'{path}.tmp') as conn:
+        for table, csv_path in source_files.items():
+            df = pd.read_csv(csv_path)
+            if table == 'careers':
+                #lower-case name for case-insensitive indexed lookups
+                df.insert(1, 'NameKey', df['PlayerName'].str.lower())
+            df.to_sql(table, conn, index=False)
+            for column in indexes[table]:
+                conn.execute(f'CREATE INDEX "ix_{table}_{column}" ON "{table}" ("{column}")')
+
+        #hashes of the csvs the database was built from, so a stale database is never used
+        conn.execute('CREATE TABLE meta (path TEXT PRIMARY KEY, hash TEXT)')
+        conn.executemany('INSERT INTO meta VALUES (?, ?)', [(p, file_hash(p)) for p in source_files.values()])
+    conn.close()
+    os.replace(f'{path}.tmp', path)
+    print(f"Saved SQLite database to {path}")
+
+#connection to the database if it exists and matches the cleaned csvs, otherwise None
+def open_database(path=DB_PATH):
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(path, check_same_thread=False)
+    recorded = dict(conn.execute('SELECT path, hash FROM meta').fetchall())
+    if any(recorded.get(p) != file_hash(p) for p in source_files.values()):
+        conn.close()
+        return None
+    return conn
+
+#selected columns of the rows matching the filters, a value matches exactly and a (low, high) tuple is a range
+def query(conn, table, columns='*', order_by=None, limit=None, **filters):
+    clauses, params = [], []
+    for column, value in filters.items():
+        if isinstance(value, tuple):
+            low, high = value
+            if low is not None:
+                clauses.append(f'"{column}" >= ?')
+                params.append(low)
+            if high is not None:
+                clauses.append(f'"{column}" <= ?')
+                params.append(high)
+        else:
+            clauses.append(f'"{column}" = ?')
+            params.append(value)
+
+    select = '*' if columns == '*' else ', '.join(f'"{column}"' for column in columns)
+    sql = f'SELECT {select} FROM "{table}"'
+    if clauses:
+        sql += ' WHERE ' + ' AND '.join(clauses)
+    if order_by:
+        sql += f' ORDER BY {order_by}'
+    if limit:
+        sql += f' LIMIT {int(limit)}'
+    return pd.read_sql_query(sql, conn, params=params)
+
+#player id for a lower-case name, a name shared by several players resolves to the one with the most runs
+def find_player_id(conn, player_name):
+    found = query(conn, 'careers', ['PlayerID'], order_by='COALESCE(Runs_24, Runs_19) DESC', limit=1, NameKey=player_name)
+    return found['PlayerID'].iloc[0] if len(found) else None
+
+#one row of the career table, with the same types as load_careers
+def career_row(conn, player_id):
+    career = query(conn, 'careers', PlayerID=player_id).drop(columns=['NameKey']).set_index('PlayerID')
+    dtypes = {f'{col}_{snapshot}': 'Int64' for col in int_columns for snapshot in ('19', '24')}
+    return career.astype(dtypes).iloc[0]
@@ -0,0 +1,96 @@
+#imports
+import argparse
+import os
+import joblib
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from joblib import Memory, Parallel, delayed
+from sklearn.metrics import mean_absolute_error
+from Predictor_Build_Manifest import code_hash, file_hash
+from Predictor_Data import load_datasets, prepare_training_data, split_training_data
+from Predictor_Model_Store import saved_model_path
+
+#cached importances and reports
+memory = Memory('CACHE/', verbose=0)
+report_dir = 'REPORTS/'
+
+#joblib only tracks the cached function's own source, so the data and code it depends on are hashed into the key
+importance_data = 'CLEANED_DATA/D19_CLEAN.csv'
+importance_code = ['Predictor_Data.py', 'Predictor_Importance.py']
+
+#mae after shuffling one column of the test rows
+def permuted_mae(model, X, y, column, seed):
+    X_permuted = X.copy()
+    X_permuted[:, column] = np.random.default_rng(seed).permutation(X_permuted[:, column])
+    return mean_absolute_error(y, model.predict(X_permuted))
+
+#mean and std of the mae increase when each feature is shuffled, repeats run in parallel across cores
+def permutation_importances(model, X, y, n_repeats=10, n_jobs=-1, seed=42):
+    #the unshuffled baseline is predicted once and shared by every feature and repeat
+    baseline_mae = mean_absolute_error(y, model.predict(X))
+    tasks = [(column, seed + repeat) for column in range(X.shape[1]) for repeat in range(n_repeats)]
+    maes = Parallel(n_jobs=n_jobs)(delayed(permuted_mae)(model, X, y, column, task_seed) for column, task_seed in tasks)
+    increases = np.array(maes).reshape(X.shape[1], n_repeats) - baseline_mae
+    return increases.mean(axis=1), increases.std(axis=1)
+
+#impurity and permutation importances of the saved model, cached per model, data and code version
+@memory.cache
+def model_importances(model_hash, data_hash, importance_code_hash, n_repeats):
+    saved = joblib.load(saved_model_path)
+    model, scaler_target = saved['model'], saved['scaler_target']
+
+    #same held-out rows the saved model was evaluated on
+    d19, d24 = load_datasets()
+    X, y = prepare_training_data(d19)[:2]
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
+    X_test = X_test.reindex(columns=saved['feature_names'], fill_value=0)
+
+    #models without impurity importances (gradient boosting) only get permutation scores
+    impurity = getattr(model, 'feature_importances_', np.full(X_test.shape[1], np.nan))
+    mean, std = permutation_importances(model, X_test.to_numpy(dtype=float), y_test.to_numpy().ravel(), n_repeats)
+
+    #runs are min-max scaled, so an mae converts back by the target's range
+    runs_range = scaler_target.data_range_[0]
+    return pd.DataFrame({
+        'Feature': X_test.columns,
+        'Impurity': np.round(impurity, 4),
+        'PermutationMAE': np.round(mean * runs_range, 2),
+        'PermutationStd': np.round(std * runs_range, 2),
+    }).sort_values('PermutationMAE', ascending=False).reset_index(drop=True)
+
+#bar chart of permutation importances
+def plot_importances(report):
+    table = report.sort_values('PermutationMAE')
+    plt.figure(figsize=(10, 8))
+    plt.barh(table['Feature'], table['PermutationMAE'], xerr=table['PermutationStd'])
+    plt.title("Permutation Importance - Career Runs Model")
+    plt.xlabel("Increase in MAE (runs)")
+    plt.tight_layout()
+    plt.savefig(f'{report_dir}importance.png')
+    plt.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Feature importances of the saved career runs model.")
+    parser.add_argument('--repeats', type=int, default=10, help="shuffles per feature")
+    parser.add_argument('--charts', action='store_true', help="save a chart to REPORTS/")
+    args = parser.parse_args()
+
+    #only reports on the saved model, nothing is retrained
+    if not os.path.exists(saved_model_path):
+        print("No saved model found, run Predictor_Model.py first.")
+        raise SystemExit(1)
+
+    report = model_importances(file_hash(saved_model_path), file_hash(importance_data),
+                               code_hash(importance_code), args.repeats)
+
+    #save the full table
+    os.makedirs(report_dir, exist_ok=True)
+    output_file = f'{report_dir}importance.csv'
+    report.to_csv(output_file, index=False)
+
+    print("\nFEATURE IMPORTANCE (permutation = increase in MAE in runs when the feature is shuffled)")
+    print(report.to_string(index=False))
+    if args.charts:
+        plot_importances(report)
+    print(f"\n✅ Saved importances to {output_file}")
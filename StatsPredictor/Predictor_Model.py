@@ -1,376 +1,298 @@
 #all imports
+import argparse
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import r2_score, mean_absolute_error, root_mean_squared_error
-
-#load datasets
-d19 = pd.read_csv('CLEANED_DATA/D19_CLEAN.csv') #data until 2019
-d24 = pd.read_csv('CLEANED_DATA/D24_CLEAN.csv') #data until 2024
-
-#columns to scale
-num_features = ['Matches', 'Innings', 'NotOut', 'HighestScore', 'Ducks',
-            'Centuries', 'HalfCenturies', 'Average', 'FirstMatch',
-            'LastMatch', 'CenturyConversion', 'FiftyPlusScorePercentage',
-            'DuckPercentage', 'NotOutPercentage', 'CareerLength',
-            'MatchesPerYear', 'CurrentPlayer']
-
-target_column = ['Runs']
-
-#one-hot encoding for countries
-d19_encoded = pd.get_dummies(d19, columns=['Country'], drop_first=True)
-
-#apply scaling
-scaler_features = MinMaxScaler()
-scaler_target = MinMaxScaler()
-d19_encoded[num_features] = scaler_features.fit_transform(d19_encoded[num_features])
-d19_encoded[target_column] = scaler_target.fit_transform(d19_encoded[target_column])
-
-#drop player name to train model on only numerical values
-d19_encoded = d19_encoded.drop(columns=['PlayerName'])
-
-#define features (X) and target (y)
-X = d19_encoded.drop(columns=target_column)  #all features minus runs
-y = d19_encoded[target_column]  #target = runs
-
-#split data in train and test sets, 80 - 20 ratio
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-#training a random forest regressor
-model = RandomForestRegressor(n_estimators=100, random_state=42)
-model.fit(X_train, y_train.values.ravel())
-
-#model evaluation
-y_pred_scaled = model.predict(X_test)
-y_test_actual = scaler_target.inverse_transform(y_test)
-y_pred_actual = scaler_target.inverse_transform(y_pred_scaled.reshape(-1, 1))
-
-#evaluate model performance, displayed later
-r2 = r2_score(y_test_actual, y_pred_actual)
-mae = mean_absolute_error(y_test_actual, y_pred_actual)
-rmse = root_mean_squared_error(y_test_actual, y_pred_actual)
-
-#output model metrics
-print("\nGENERAL MODEL METRICS")
-print(f"R² Score: {r2:.4f}")
-print(f"Mean Absolute Error (MAE): {mae:.2f}")
-print(f"Root Mean Squared Error (RMSE): {rmse:.2f}")
-
-#cross-validation
-cv_scores = cross_val_score(model, X_train, y_train.values.ravel(), cv=10, scoring='r2')
-
-#cross-validation results
-print("\nCROSS-VALIDATION RESULTS")
-print(f"Mean R² Score: {cv_scores.mean():.4f}")
-print(f"Standard Deviation of R² Scores: {cv_scores.std():.4f}")
-
-#extract feature names
-feature_names = X_train.columns
+import matplotlib.pyplot as plt
+from Predictor_Data import num_features, load_careers, snapshot_stats
+from Predictor_Backends import BACKENDS, DEFAULT_BACKEND
+from Predictor_Database import open_database, find_player_id, career_row
+from Predictor_Model_Store import ModelStore
+from Predictor_Prediction_Cache import PredictionCache
+
+#estimator choice, run Predictor_Backends.py to compare them
+parser = argparse.ArgumentParser(description="Predict career runs for a player.")
+parser.add_argument('--backend', choices=BACKENDS, default=DEFAULT_BACKEND)
+parser.add_argument('--intervals', action='store_true', help="show P10/P50/P90 of the forest's trees next to each prediction")
+args = parser.parse_args()
+
+#load the saved model or train one in the background while the first player is typed,
+#then retrain in the background when the cleaned data changes
+store = ModelStore(args.backend).start()
+if args.intervals and args.backend == 'hist_gradient_boosting':
+    print(f"Prediction intervals need a forest, they are not available for --backend {args.backend}.")
+
+#repeated queries are answered from the cache until the model is retrained
+cache = PredictionCache()
+
+#player lookups load straight away so names are checked while the model is still loading,
+#indexed through the database when Predictor_PreProcessing.py --sqlite has built a current one
+db = open_database()
+careers, name_index = load_careers()
+#model version the lookups follow, None until the first one is ready
+lookup_version = None
+
+#lookups from the cleaned data of a model version, the database is checked again so a stale one is never used
+def lookup_tables(model_version, old_db):
+    if old_db is not None:
+        old_db.close()
+    return open_database(), model_version.careers, model_version.name_index, model_version.version
+
+#d19 and d24 stats of a player, None when missing from a snapshot
+def player_snapshots(player_id):
+    career = career_row(db, player_id) if db is not None else careers.loc[player_id]
+    return snapshot_stats(career, '19'), snapshot_stats(career, '24')
+
+#output model metrics, shown once the model is ready
+def print_metrics(metrics):
+    print("\nGENERAL MODEL METRICS")
+    print(f"R² Score: {metrics['r2']:.4f}")
+    print(f"Mean Absolute Error (MAE): {metrics['mae']:.2f}")
+    print(f"Root Mean Squared Error (RMSE): {metrics['rmse']:.2f}")
+
+    #cross-validation results
+    print("\nCROSS-VALIDATION RESULTS")
+    print(f"Mean R² Score: {metrics['cv_mean']:.4f}")
+    print(f"Standard Deviation of R² Scores: {metrics['cv_std']:.4f}")
+
+#spread of the forest's trees reported in interval mode
+INTERVAL_QUANTILES = [0.1, 0.5, 0.9]
+
+#quantiles of the individual trees' predictions for a batch of scaled rows, in runs, one row per input row
+def tree_intervals(model_version, rows_df, quantiles=INTERVAL_QUANTILES):
+    #every tree scores the whole batch, stacked into a trees x rows matrix
+    X = np.asarray(rows_df, dtype=np.float32)
+    per_tree = np.stack([tree.predict(X, check_input=False) for tree in model_version.model.estimators_])
+    #quantiles along the tree axis, then back to runs
+    scaled = np.quantile(per_tree, quantiles, axis=0)
+    runs = model_version.scaler_target.inverse_transform(scaled.reshape(-1, 1)).reshape(scaled.shape)
+    return runs.T
+
+#interval text shown next to a point prediction
+def format_interval(interval):
+    return " (P10 / P50 / P90: " + " / ".join(str(int(round(runs))) for runs in interval) + ")"
+
+#career milestones reported on the trajectory curve
+MILESTONES = [5000, 8000, 10000, 12000, 15000]
+
+#predicted runs for every innings count up to the cap, scored in one batch
+def predict_trajectory(model_version, player_stats, max_innings=500):
+    current_innings = int(player_stats['Innings'])
+    innings = np.arange(current_innings + 1, max_innings + 1)
+    additional_innings = innings - current_innings
+
+    #same projection rules as a single expected innings prediction
+    trajectory_df = pd.DataFrame({
+        "Matches": int(player_stats['Matches']) + additional_innings // 2, #1 match = 2 innings
+        "Innings": innings,
+        "NotOut": int(player_stats['NotOut']) + additional_innings // 10, #10% of new innings are not out
+        "HighestScore": player_stats['HighestScore'],
+        "Average": player_stats['Average'],
+        "Centuries": int(player_stats['Centuries']) + additional_innings // 7, #1 century in every 7 new innings
+        "HalfCenturies": int(player_stats['HalfCenturies']) + additional_innings // 3, #1 half century in every 3 new innings
+        "Ducks": int(player_stats['Ducks']) + additional_innings // 20, #1 duck in every 20 new innings
+        "FirstMatch": player_stats['FirstMatch']
+    })
+
+    #re-order and match columns, scale and predict the whole grid at once
+    trajectory_df = trajectory_df.reindex(columns=model_version.feature_names, fill_value=0)
+    trajectory_df[num_features] = model_version.scaler_features.transform(trajectory_df[num_features])
+    predicted_scaled = model_version.model.predict(trajectory_df) if len(trajectory_df) else np.empty(0)
+    predicted_runs = model_version.scaler_target.inverse_transform(predicted_scaled.reshape(-1, 1)).ravel()
+
+    return pd.DataFrame({"Innings": innings, "PredictedRuns": predicted_runs})
+
+#first innings at which the predicted curve reaches each milestone, None if never
+def milestone_crossings(trajectory, milestones=MILESTONES):
+    #running max so a dip in the forest's curve does not hide an earlier crossing
+    reached = np.maximum.accumulate(trajectory['PredictedRuns'].to_numpy())
+    positions = np.searchsorted(reached, milestones, side='left')
+    innings = trajectory['Innings'].to_numpy()
+    return {milestone: (int(innings[pos]) if pos < len(innings) else None)
+            for milestone, pos in zip(milestones, positions)}
+
+#predicted runs now and after the expected innings, the latest stats give the first and the projection stats the second
+def predict_runs(model_version, latest_stats, projection_stats, expected_innings, intervals=False):
+    #predict for latest innings
+    latest_player_data = {
+        "Matches": [latest_stats['Matches']],
+        "Innings": [latest_stats['Innings']],
+        "NotOut": [latest_stats['NotOut']],
+        "HighestScore": [latest_stats['HighestScore']],
+        "Average": [latest_stats['Average']],
+        "Centuries": [latest_stats['Centuries']],
+        "HalfCenturies": [latest_stats['HalfCenturies']],
+        "Ducks": [latest_stats['Ducks']],
+        "FirstMatch": [latest_stats['FirstMatch']]
+    }
+
+    #convert to a dataframe
+    latest_player_df = pd.DataFrame(latest_player_data)
+    #re-order and match columns
+    latest_player_df = latest_player_df.reindex(columns=model_version.feature_names, fill_value=0)
+    #normalize the num features using the same scaler
+    latest_player_df[num_features] = model_version.scaler_features.transform(latest_player_df[num_features])
+    #predict using model, scaled output
+    predicted_latest_scaled = model_version.model.predict(latest_player_df)[0]
+    #convert scaled to actual (reverse scaling)
+    predicted_latest_actual = model_version.scaler_target.inverse_transform([[predicted_latest_scaled]])[0][0]
+    #round prediction
+    predicted_latest_actual = int(round(predicted_latest_actual))
+
+    #calculate expected innings and matches
+    additional_innings = expected_innings - projection_stats['Innings']
+    additional_matches = additional_innings // 2  #1 match = 2 innings
+
+    #predict for expected innings
+    future_player_data = {
+        "Matches": [projection_stats['Matches'] + additional_matches],
+        "Innings": [expected_innings],
+        "NotOut": [projection_stats['NotOut'] + (additional_innings // 10)], #10% of new innings are not out
+        "HighestScore": [projection_stats['HighestScore']],
+        "Average": [projection_stats['Average']],
+        "Centuries": [projection_stats['Centuries'] + (additional_innings // 7)], #1 century in every 7 new innings
+        "HalfCenturies": [projection_stats['HalfCenturies'] + (additional_innings // 3)], #1 half century in every 3 new innings
+        "Ducks": [projection_stats['Ducks'] + (additional_innings // 20)], #1 duck in every 20 new innings
+        "FirstMatch": [projection_stats['FirstMatch']]
+    }
+
+    #convert to a dataframe
+    future_player_df = pd.DataFrame(future_player_data)
+    #re-order and match columns
+    future_player_df = future_player_df.reindex(columns=model_version.feature_names, fill_value=0)
+    #normalize the num features using the same scaler
+    future_player_df[num_features] = model_version.scaler_features.transform(future_player_df[num_features])
+    #predict using model, scaled output
+    predicted_future_scaled = model_version.model.predict(future_player_df)[0]
+    #convert scaled to actual (reverse scaling)
+    predicted_future_actual = model_version.scaler_target.inverse_transform([[predicted_future_scaled]])[0][0]
+    #round prediction
+    predicted_future_actual = int(round(predicted_future_actual))
+
+    #both rows go through the trees as one batch, forests only
+    predicted_intervals = None
+    if intervals and hasattr(model_version.model, 'estimators_'):
+        predicted_intervals = tree_intervals(model_version, pd.concat([latest_player_df, future_player_df])).tolist()
+
+    return predicted_latest_actual, predicted_future_actual, predicted_intervals
+
+metrics_shown = False
 while True:
     #player name input, lower() is used standardize player name from input and data
     while True:
         player_name = input("Enter the Player's Name: ").strip().lower()
-        #check in d19
-        player_row = d19[d19['PlayerName'].str.lower() == player_name.lower()]
-        #check in d24
-        player_row_updated = d24[d24['PlayerName'].str.lower() == player_name.lower()]
+        #a retrained model brings new cleaned data, the lookups follow it
+        latest_version = store.peek()
+        if latest_version is not None and latest_version.version != lookup_version:
+            db, careers, name_index, lookup_version = lookup_tables(latest_version, db)
+        #one indexed lookup in the career table covers both d19 and d24
+        if db is not None:
+            player_id = find_player_id(db, player_name)
+        else:
+            player_id = name_index.get(player_name)
 
-        if not player_row.empty or not player_row_updated.empty:
+        if player_id is not None:
             break
         else:
             print("Player Not Found in Dataset. Please Enter a Valid Player Name.")
 
-    #player found in both d19 and d24
-    if not player_row.empty and not player_row_updated.empty:
-        #found in both
-        print("Player Found in Both d19 and d24.")
+    #extract player stats from d19 and d24, None when missing from a snapshot
+    player_stats, player_stats_updated = player_snapshots(player_id)
 
-        #extract player stats from d19
-        player_stats = player_row.iloc[0].to_dict()
-
-        #extract player stats from d24
-        player_stats_updated = player_row_updated.iloc[0].to_dict()
-
-        current_innings = player_stats['Innings']
-
-        #expected innings input
-        while True:
-            try:
-                expected_innings = int(input("Enter Total Number of Expected Innings: "))
-                if expected_innings <= current_innings:
-                    print("Expected Innings should be Greater than Current Innings.")
-                    continue
-                elif expected_innings > 500:
-                    print("Enter a Realistic Value for Expected Innings")
-                    continue
-                break
-            except ValueError:
-                print("Invalid Input. Please Enter a Valid Number.")
-
-        #d24 stats for display
-        latest_name = player_stats_updated['PlayerName']
-        latest_innings = player_stats_updated['Innings']
-        latest_runs = player_stats_updated['Runs']
-        latest_avg = player_stats_updated['Average']
-
-        #predict for latest innings (d24 innings)
-        latest_player_data = {
-            "Matches": [player_stats_updated['Matches']],
-            "Innings": [latest_innings],
-            "NotOut": [player_stats_updated['NotOut']],
-            "HighestScore": [player_stats_updated['HighestScore']],
-            "Average": [latest_avg],
-            "Centuries": [player_stats_updated['Centuries']],
-            "HalfCenturies": [player_stats_updated['HalfCenturies']],
-            "Ducks": [player_stats_updated['Ducks']],
-            "FirstMatch": [player_stats_updated['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        latest_player_df = pd.DataFrame(latest_player_data)
-        #re-order and match columns
-        latest_player_df = latest_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        latest_player_df[num_features] = scaler_features.transform(latest_player_df[num_features])
-        #predict using model, scaled output
-        predicted_latest_scaled = model.predict(latest_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_latest_actual = scaler_target.inverse_transform([[predicted_latest_scaled]])[0][0]
-        #round prediction
-        predicted_latest_actual = int(round(predicted_latest_actual))
-
-        #calculate expected innings and matches
-        additional_innings = expected_innings - current_innings
-        additional_matches = additional_innings // 2  #1 match = 2 innings
-
-        #predict for expected innings
-        future_player_data = {
-            "Matches": [player_stats['Matches'] + additional_matches],
-            "Innings": [expected_innings],
-            "NotOut": [player_stats['NotOut'] + (additional_innings // 10)], #10% of new innings are not out
-            "HighestScore": [player_stats['HighestScore']],
-            "Average": [player_stats['Average']],
-            "Centuries": [player_stats['Centuries'] + (additional_innings // 7)], #1 century in every 7 new innings
-            "HalfCenturies": [player_stats['HalfCenturies'] + (additional_innings // 3)], #1 half century in every 3 new innings
-            "Ducks": [player_stats['Ducks'] + (additional_innings // 20)], #1 duck in every 20 new innings
-            "FirstMatch": [player_stats['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        future_player_df = pd.DataFrame(future_player_data)
-        #re-order and match columns
-        future_player_df = future_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        future_player_df[num_features] = scaler_features.transform(future_player_df[num_features])
-        #predict using model, scaled output
-        predicted_future_scaled = model.predict(future_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_future_actual = scaler_target.inverse_transform([[predicted_future_scaled]])[0][0]
-        #round prediction
-        predicted_future_actual = int(round(predicted_future_actual))
-
-        #display player stats and predictions
-        print("\n----- PLAYER STATS (Latest from d24) -----")
-        print(f"PLAYER NAME: {latest_name.upper()}")
-        print(f"CURRENT INNINGS: {latest_innings}")
-        print(f"CURRENT RUNS: {latest_runs}")
-        print(f"CURRENT AVERAGE: {latest_avg:.2f}")
-        print(f"\nPredictions:")
-        print(f"PREDICTED RUNS AFTER {latest_innings} INNINGS: {predicted_latest_actual}")
-        print(f"PREDICTED RUNS AFTER {expected_innings} INNINGS: {predicted_future_actual}")
-
-    #player found in only d19 and not in d24
-    elif not player_row.empty and player_row_updated.empty:
-        #found in d19 only
+    if player_stats is not None and player_stats_updated is not None:
+        print("Player Found in Both d19 and d24.")
+        stats_source = "Latest from d24"
+    elif player_stats is not None:
         print("Player Found in Only d19.")
-        
-        #extract player stats from d19
-        player_stats = player_row.iloc[0].to_dict()
-
-        current_innings = player_stats['Innings']
-
-        #expected innings input
-        while True:
-            try:
-                expected_innings = int(input("Enter Total Number of Expected Innings: "))
-                if expected_innings <= current_innings:
-                    print("Expected Innings should be Greater than Current Innings.")
-                    continue
-                elif expected_innings > 500:
-                    print("Enter a Realistic Value for Expected Innings")
-                    continue
-                break
-            except ValueError:
-                print("Invalid Input. Please Enter a Valid Number.")
-
-        #d19 stats for display
-        latest_name = player_stats['PlayerName']
-        latest_innings = player_stats['Innings']
-        latest_runs = player_stats['Runs']
-        latest_avg = player_stats['Average']        
-
-        #predict for latest innings (d19 innings)
-        latest_player_data = {
-            "Matches": [player_stats['Matches']],
-            "Innings": [latest_innings],
-            "NotOut": [player_stats['NotOut']],
-            "HighestScore": [player_stats['HighestScore']],
-            "Average": [latest_avg],
-            "Centuries": [player_stats['Centuries']],
-            "HalfCenturies": [player_stats['HalfCenturies']],
-            "Ducks": [player_stats['Ducks']],
-            "FirstMatch": [player_stats['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        latest_player_df = pd.DataFrame(latest_player_data)
-        #re-order and match columns
-        latest_player_df = latest_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        latest_player_df[num_features] = scaler_features.transform(latest_player_df[num_features])
-        #predict using model, scaled output
-        predicted_latest_scaled = model.predict(latest_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_latest_actual = scaler_target.inverse_transform([[predicted_latest_scaled]])[0][0]
-        #round prediction
-        predicted_latest_actual = int(round(predicted_latest_actual))
-
-        #calculate expected innings and matches
-        additional_innings = expected_innings - current_innings
-        additional_matches = additional_innings // 2  #1 match = 2 innings
-
-        #predict for expected innings
-        future_player_data = {
-            "Matches": [player_stats['Matches'] + additional_matches],
-            "Innings": [expected_innings],
-            "NotOut": [player_stats['NotOut'] + (additional_innings // 10)], #10% of new innings are not out
-            "HighestScore": [player_stats['HighestScore']],
-            "Average": [player_stats['Average']],
-            "Centuries": [player_stats['Centuries'] + (additional_innings // 7)], #1 century in every 7 new innings
-            "HalfCenturies": [player_stats['HalfCenturies'] + (additional_innings // 3)], #1 half century in every 3 new innings
-            "Ducks": [player_stats['Ducks'] + (additional_innings // 20)], #1 duck in every 20 new innings
-            "FirstMatch": [player_stats['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        future_player_df = pd.DataFrame(future_player_data)
-        #re-order and match columns
-        future_player_df = future_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        future_player_df[num_features] = scaler_features.transform(future_player_df[num_features])
-        #predict using model, scaled output
-        predicted_future_scaled = model.predict(future_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_future_actual = scaler_target.inverse_transform([[predicted_future_scaled]])[0][0]
-        #round prediction
-        predicted_future_actual = int(round(predicted_future_actual))
-
-        #display player stats and predictions
-        print("\n----- PLAYER STATS (from d19) -----")
-        print(f"PLAYER NAME: {latest_name.upper()}")
-        print(f"CURRENT INNINGS: {latest_innings}")
-        print(f"CURRENT RUNS: {latest_runs}")
-        print(f"CURRENT AVERAGE: {latest_avg:.2f}")
-        print(f"\nPredictions:")
-        print(f"PREDICTED RUNS AFTER {latest_innings} INNINGS: {predicted_latest_actual}")
-        print(f"PREDICTED RUNS AFTER {expected_innings} INNINGS: {predicted_future_actual}")
-
-    #player found in only d24 and not in d19
-    elif not player_row_updated.empty and player_row.empty:
-        #found in d24 only
+        stats_source = "from d19"
+    else:
         print("Player Found in Only d24.")
-        
-        #extract player stats from d24
-        player_stats_updated = player_row_updated.iloc[0].to_dict()
-
-        current_innings = player_stats_updated['Innings']
-
-        #expected innings input
-        while True:
-            try:
-                expected_innings = int(input("Enter Total Number of Expected Innings: "))
-                if expected_innings <= current_innings:
-                    print("Expected Innings should be Greater than Current Innings.")
-                    continue
-                elif expected_innings > 500:
-                    print("Enter a Realistic Value for Expected Innings")
-                    continue
-                break
-            except ValueError:
-                print("Invalid Input. Please Enter a Valid Number.")
-
-        #d24 stats for display
-        latest_name = player_stats_updated['PlayerName']
-        latest_innings = player_stats_updated['Innings']
-        latest_runs = player_stats_updated['Runs']
-        latest_avg = player_stats_updated['Average']
-
-        #predict for latest innings (d24 innings)
-        latest_player_data = {
-            "Matches": [player_stats_updated['Matches']],
-            "Innings": [latest_innings],
-            "NotOut": [player_stats_updated['NotOut']],
-            "HighestScore": [player_stats_updated['HighestScore']],
-            "Average": [latest_avg],
-            "Centuries": [player_stats_updated['Centuries']],
-            "HalfCenturies": [player_stats_updated['HalfCenturies']],
-            "Ducks": [player_stats_updated['Ducks']],
-            "FirstMatch": [player_stats_updated['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        latest_player_df = pd.DataFrame(latest_player_data)
-        #re-order and match columns
-        latest_player_df = latest_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        latest_player_df[num_features] = scaler_features.transform(latest_player_df[num_features])
-        #predict using model, scaled output
-        predicted_latest_scaled = model.predict(latest_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_latest_actual = scaler_target.inverse_transform([[predicted_latest_scaled]])[0][0]
-        #round prediction
-        predicted_latest_actual = int(round(predicted_latest_actual))
-
-        #calculate expected innings and matches
-        additional_innings = expected_innings - current_innings
-        additional_matches = additional_innings // 2  #1 match = 2 innings
-
-        #predict for expected innings
-        future_player_data = {
-            "Matches": [player_stats_updated['Matches'] + additional_matches],
-            "Innings": [expected_innings],
-            "NotOut": [player_stats_updated['NotOut'] + (additional_innings // 10)], #10% of new innings are not out
-            "HighestScore": [player_stats_updated['HighestScore']],
-            "Average": [player_stats_updated['Average']],
-            "Centuries": [player_stats_updated['Centuries'] + (additional_innings // 7)], #1 century in every 7 new innings
-            "HalfCenturies": [player_stats_updated['HalfCenturies'] + (additional_innings // 3)], #1 half century in every 3 new innings
-            "Ducks": [player_stats_updated['Ducks'] + (additional_innings // 20)], #1 duck in every 20 new innings
-            "FirstMatch": [player_stats_updated['FirstMatch']]
-        }
-
-        #convert to a dataframe
-        future_player_df = pd.DataFrame(future_player_data)
-        #re-order and match columns
-        future_player_df = future_player_df.reindex(columns=feature_names, fill_value=0)
-        #normalize the num features using the same scaler
-        future_player_df[num_features] = scaler_features.transform(future_player_df[num_features])
-        #predict using model, scaled output
-        predicted_future_scaled = model.predict(future_player_df)[0]
-        #convert scaled to actual (reverse scaling)
-        predicted_future_actual = scaler_target.inverse_transform([[predicted_future_scaled]])[0][0]
-        #round prediction
-        predicted_future_actual = int(round(predicted_future_actual))
-
-        #display player stats and predictions
-        print("\n----- PLAYER STATS (from d24) -----")
-        print(f"PLAYER NAME: {latest_name.upper()}")
-        print(f"CURRENT INNINGS: {latest_innings}")
-        print(f"CURRENT RUNS: {latest_runs}")
-        print(f"CURRENT AVERAGE: {latest_avg:.2f}")
-        print(f"\nPredictions:")
-        print(f"PREDICTED RUNS AFTER {latest_innings} INNINGS: {predicted_latest_actual}")
-        print(f"PREDICTED RUNS AFTER {expected_innings} INNINGS: {predicted_future_actual}")
+        stats_source = "from d24"
+
+    #latest stats are shown and predicted, projections start from d19 when available
+    latest_stats = player_stats_updated if player_stats_updated is not None else player_stats
+    projection_stats = player_stats if player_stats is not None else player_stats_updated
+
+    current_innings = projection_stats['Innings']
+
+    #expected innings input
+    while True:
+        try:
+            expected_innings = int(input("Enter Total Number of Expected Innings: "))
+            if expected_innings <= current_innings:
+                print("Expected Innings should be Greater than Current Innings.")
+                continue
+            elif expected_innings > 500:
+                print("Enter a Realistic Value for Expected Innings")
+                continue
+            break
+        except ValueError:
+            print("Invalid Input. Please Enter a Valid Number.")
+
+    #one model version for the whole prediction, even if a retrain lands meanwhile,
+    #only waits here if it is still loading after every answer has been typed
+    current = store.current()
+    if not metrics_shown:
+        print_metrics(current.metrics)
+        metrics_shown = True
+
+    #the model changed since the lookup, so the player's stats are read again from its cleaned data
+    if current.version != lookup_version:
+        db, careers, name_index, lookup_version = lookup_tables(current, db)
+        if player_id in careers.index:
+            player_stats, player_stats_updated = player_snapshots(player_id)
+            latest_stats = player_stats_updated if player_stats_updated is not None else player_stats
+            projection_stats = player_stats if player_stats is not None else player_stats_updated
+
+    #latest stats for display
+    latest_name = latest_stats['PlayerName']
+    latest_innings = latest_stats['Innings']
+    latest_runs = latest_stats['Runs']
+    latest_avg = latest_stats['Average']
+
+    #repeated queries are answered from the cache until the model is retrained
+    key = cache.key(current.version, player_id, expected_innings, args.intervals)
+    cached = cache.get(key)
+    if cached is None:
+        cached = predict_runs(current, latest_stats, projection_stats, expected_innings, args.intervals)
+        cache.put(key, cached)
+    predicted_latest_actual, predicted_future_actual, predicted_intervals = cached
+    latest_interval, future_interval = map(format_interval, predicted_intervals) if predicted_intervals else ("", "")
+
+    #display player stats and predictions
+    print(f"\n----- PLAYER STATS ({stats_source}) -----")
+    print(f"PLAYER NAME: {latest_name.upper()}")
+    print(f"CURRENT INNINGS: {latest_innings}")
+    print(f"CURRENT RUNS: {latest_runs}")
+    print(f"CURRENT AVERAGE: {latest_avg:.2f}")
+    print(f"\nPredictions:")
+    print(f"PREDICTED RUNS AFTER {latest_innings} INNINGS: {predicted_latest_actual}{latest_interval}")
+    print(f"PREDICTED RUNS AFTER {expected_innings} INNINGS: {predicted_future_actual}{future_interval}")
+
+    #full career trajectory from the current total, so milestones are counted from the latest stats shown above
+    while True:
+        show_trajectory = input("Do You Want to See the Full Career Trajectory? (yes/no): ").strip().lower()
+        if show_trajectory in ['yes', 'no']:
+            break
+        else:
+            print("Please Enter 'yes' or 'no'.")
+    if show_trajectory == 'yes':
+        trajectory = predict_trajectory(current, latest_stats)
+        print("\n----- CAREER MILESTONES -----")
+        for milestone, milestone_innings in milestone_crossings(trajectory).items():
+            if milestone <= latest_stats['Runs']:
+                print(f"{milestone} RUNS: ALREADY REACHED")
+            elif milestone_innings is None:
+                print(f"{milestone} RUNS: NOT REACHED BY 500 INNINGS")
+            else:
+                print(f"{milestone} RUNS: AFTER {milestone_innings} INNINGS")
+
+        plt.figure(figsize=(10, 6))
+        plt.plot(trajectory['Innings'], trajectory['PredictedRuns'], linewidth=2)
+        plt.title(f"Predicted Career Trajectory - {latest_name}")
+        plt.xlabel("Innings")
+        plt.ylabel("Predicted Runs")
+        plt.tight_layout()
+        plt.show()
 
     #another prediction
     while True:
@@ -380,5 +302,8 @@ while True:
         else:
             print("Please Enter 'yes' or 'no'.")
     if another == 'no':
+        print(f"Prediction Cache Hit Rate: {cache.hit_rate:.0%} ({cache.hits} of {cache.hits + cache.misses} predictions)")
+        cache.drop_stale({store.current().version})
+        cache.close()
         print("Exiting Predictor Model")
         break
\ No newline at end of file
@@ -0,0 +1,144 @@
+#imports
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+import joblib
+from sklearn.model_selection import cross_val_score
+from sklearn.metrics import r2_score, mean_absolute_error, root_mean_squared_error
+from Predictor_Backends import DEFAULT_BACKEND, make_model
+from Predictor_Build_Manifest import file_hash
+from Predictor_Data import (model_dir, load_datasets, load_careers, prepare_training_data,
+                            split_training_data, load_tuned_params)
+
+#saved model version, reused at launch when the data has not changed
+saved_model_path = f'{model_dir}predictor_model.pkl'
+
+#cleaned data a model version is built from
+watched_files = ['CLEANED_DATA/D19_CLEAN.csv', 'CLEANED_DATA/D24_CLEAN.csv', 'CLEANED_DATA/CAREERS.csv']
+
+#everything one prediction needs, swapped in as a single object
+ModelVersion = namedtuple('ModelVersion', ['version', 'model', 'scaler_features', 'scaler_target',
+                                           'feature_names', 'metrics', 'careers', 'name_index'])
+
+#id of the model that the current data, backend and tuned parameters would produce
+def data_version(backend=DEFAULT_BACKEND):
+    parts = [backend, json.dumps(load_tuned_params(), sort_keys=True)]
+    parts += [file_hash(path) or '' for path in watched_files]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+#train, evaluate and save a new model version
+def build_model_version(backend=DEFAULT_BACKEND):
+    version = data_version(backend)
+    d19, d24 = load_datasets()
+    careers, name_index = load_careers()
+
+    #encode, scale and split d19 for training
+    X, y, scaler_features, scaler_target = prepare_training_data(d19)
+    X_train, X_test, y_train, y_test = split_training_data(X, y)
+
+    #a random forest uses tuned hyperparameters if Predictor_Tuning.py has been run
+    model = make_model(backend, load_tuned_params() if backend == 'random_forest' else None)
+    model.fit(X_train, y_train.values.ravel())
+
+    #model evaluation
+    y_pred_scaled = model.predict(X_test)
+    y_test_actual = scaler_target.inverse_transform(y_test)
+    y_pred_actual = scaler_target.inverse_transform(y_pred_scaled.reshape(-1, 1))
+
+    #cross-validation, folds run in parallel across cores
+    cv_scores = cross_val_score(model, X_train, y_train.values.ravel(), cv=10, scoring='r2', n_jobs=-1)
+
+    metrics = {
+        'r2': r2_score(y_test_actual, y_pred_actual),
+        'mae': mean_absolute_error(y_test_actual, y_pred_actual),
+        'rmse': root_mean_squared_error(y_test_actual, y_pred_actual),
+        'cv_mean': cv_scores.mean(),
+        'cv_std': cv_scores.std(),
+    }
+
+    saved = {'version': version, 'model': model, 'scaler_features': scaler_features,
+             'scaler_target': scaler_target, 'feature_names': X_train.columns, 'metrics': metrics}
+    os.makedirs(model_dir, exist_ok=True)
+    #write then rename so another process never loads a half-written file
+    joblib.dump(saved, f'{saved_model_path}.tmp')
+    os.replace(f'{saved_model_path}.tmp', saved_model_path)
+
+    return ModelVersion(careers=careers, name_index=name_index, **saved)
+
+#saved model version if it was built from the current data, otherwise None
+def load_saved_version(backend=DEFAULT_BACKEND):
+    if not os.path.exists(saved_model_path):
+        return None
+    saved = joblib.load(saved_model_path)
+    if saved['version'] != data_version(backend):
+        return None
+    careers, name_index = load_careers()
+    return ModelVersion(careers=careers, name_index=name_index, **saved)
+
+#serves the current model version and rebuilds it in the background when the cleaned data changes
+class ModelStore:
+
+    def __init__(self, backend=DEFAULT_BACKEND, poll_seconds=30):
+        self.backend = backend
+        self.poll_seconds = poll_seconds
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        #the first version loads or trains in the background so the prompts can show straight away
+        self._current = None
+        self._load_error = None
+        self._ready = threading.Event()
+        threading.Thread(target=self._load, daemon=True).start()
+
+    def _load(self):
+        try:
+            self._current = load_saved_version(self.backend) or build_model_version(self.backend)
+        except Exception as error:
+            self._load_error = error
+        finally:
+            self._ready.set()
+
+    #model version to use for one prediction, waits if the first one is still loading
+    def current(self):
+        if not self._ready.is_set():
+            print("Waiting for the model to finish loading...")
+            self._ready.wait()
+        if self._current is None:
+            raise RuntimeError(f"Model could not be loaded: {self._load_error}")
+        return self._current
+
+    #model version being served without waiting for it, None while the first one is loading
+    def peek(self):
+        return self._current
+
+    #rebuild if the data changed, returns True when a new version was swapped in
+    def refresh(self):
+        with self._refresh_lock:
+            if data_version(self.backend) == self._current.version:
+                return False
+            new_version = load_saved_version(self.backend) or build_model_version(self.backend)
+            #predictions already holding the old version finish on it, new ones get this one
+            self._current = new_version
+            return True
+
+    #start the background thread that watches the cleaned data
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self):
+        self._ready.wait()
+        while self._current is not None and not self._stop.wait(self.poll_seconds):
+            try:
+                if self.refresh():
+                    print(f"\n[Model retrained on new data, version {self._current.version}]")
+            except Exception as error:
+                #keep serving the current version, try again on the next poll
+                print(f"\n[Background retraining failed: {error}]")
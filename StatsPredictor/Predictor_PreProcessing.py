@@ -1,6 +1,26 @@
 #imports
+import argparse
+import sys
 import pandas as pd
 import re
+from Predictor_Build_Manifest import BuildManifest
+from Predictor_Database import build_database
+
+parser = argparse.ArgumentParser(description="Clean the 2019 and 2024 career stats.")
+parser.add_argument('--force', action='store_true', help='rebuild even if inputs are unchanged')
+parser.add_argument('--sqlite', action='store_true', help='also load the cleaned tables into CLEANED_DATA/STATS.db')
+args = parser.parse_args()
+
+#skip cleaning when the raw stats and this script are unchanged
+manifest = BuildManifest()
+inputs = ['DATA/STATS_2019.csv', 'DATA/STATS_2024.csv']
+outputs = ['CLEANED_DATA/D19_CLEAN.csv', 'CLEANED_DATA/D24_CLEAN.csv', 'CLEANED_DATA/CAREERS.csv']
+code = ['Predictor_PreProcessing.py']
+if not args.force and manifest.is_current('clean_stats', inputs, outputs, code):
+    print("Cleaned data is up to date")
+    if args.sqlite:
+        build_database()
+    sys.exit()
 
 #load data
 d19 = pd.read_csv('DATA/STATS_2019.csv', encoding='ISO-8859-1')
@@ -109,4 +129,45 @@ print(d24.isnull().sum().sum())
 output = "CLEANED_DATA/D19_CLEAN.csv"
 d19.to_csv(output, index=False)
 output = f"CLEANED_DATA/D24_CLEAN.csv"
-d24.to_csv(output, index=False)
\ No newline at end of file
+d24.to_csv(output, index=False)
+
+#stable player id from name and country, same format in both snapshots
+def player_ids(df):
+    ids = (df["PlayerName"].str.lower().str.replace(r"[^a-z0-9]+", "_", regex=True).str.strip("_")
+           + "_" + df["Country"].str.lower())
+    #same name and country twice in one snapshot, number the repeats
+    repeats = ids.groupby(ids).cumcount()
+    return ids.where(repeats == 0, ids + "_" + (repeats + 1).astype(str))
+
+#a player who changed country between snapshots (e.g. GS Ballance, ENG then ZIM) keeps the d19 id,
+#matched by name only when neither side has a name and country match, the name is unique and the debut year agrees
+ids19, ids24 = player_ids(d19), player_ids(d24)
+unmatched19 = d19[~ids19.isin(ids24) & ~d19["PlayerName"].duplicated(keep=False)]
+unmatched24 = d24[~ids24.isin(ids19) & ~d24["PlayerName"].duplicated(keep=False)]
+moved = unmatched24.reset_index().merge(unmatched19.reset_index(), on=["PlayerName", "FirstMatch"], suffixes=("_24", "_19"))
+ids24.loc[moved["index_24"]] = ids19.loc[moved["index_19"]].to_numpy()
+
+#unified career table, one row per player with columns per snapshot
+careers = d19.set_index(ids19).add_suffix("_19").join(d24.set_index(ids24).add_suffix("_24"), how="outer")
+careers.index.name = "PlayerID"
+careers.insert(0, "PlayerName", careers["PlayerName_24"].combine_first(careers["PlayerName_19"]))
+careers.insert(1, "Country", careers["Country_24"].combine_first(careers["Country_19"]))
+careers = careers.drop(columns=["Country_19", "Country_24"])
+
+#runs and innings added between snapshots, empty if the player is missing from one
+#the 2024 stats only count from 1990, so careers that started earlier cannot be compared
+careers["RunsAdded"] = careers["Runs_24"] - careers["Runs_19"]
+careers["InningsAdded"] = careers["Innings_24"] - careers["Innings_19"]
+not_comparable = ((careers["FirstMatch_19"] < careers["FirstMatch_24"])
+                  | (careers["RunsAdded"] < 0) | (careers["InningsAdded"] < 0))
+careers.loc[not_comparable, ["RunsAdded", "InningsAdded"]] = pd.NA
+
+output = "CLEANED_DATA/CAREERS.csv"
+careers.sort_index().to_csv(output)
+
+#record what the cleaned files were built from
+manifest.record('clean_stats', inputs, outputs, code)
+
+#optional indexed copy of the cleaned tables
+if args.sqlite:
+    build_database()
\ No newline at end of file
@@ -0,0 +1,60 @@
+#imports
+import os
+import shelve
+from collections import OrderedDict
+
+#cached predictions survive restarts in this shelf
+CACHE_PATH = 'CACHE/predictions'
+
+#least-recently-used predictions in memory in front of an on-disk shelf, keyed by model version and query
+class PredictionCache:
+
+    def __init__(self, path=CACHE_PATH, max_items=256):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_items = max_items
+        self._memory = OrderedDict()
+        self._disk = shelve.open(path)
+        self.hits = 0
+        self.misses = 0
+
+    #a new model version gives new keys, so results from a retrained model never collide with old ones
+    def key(self, version, *query):
+        return '|'.join([version] + [str(part).strip().lower() for part in query])
+
+    #cached result or None
+    def get(self, key):
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if key in self._disk:
+            self.hits += 1
+            self._remember(key, self._disk[key])
+            return self._memory[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        self._remember(key, value)
+        self._disk[key] = value
+        self._disk.sync()
+
+    #remove results from model versions no longer being served
+    def drop_stale(self, versions):
+        for key in [key for key in self._disk.keys() if key.split('|', 1)[0] not in versions]:
+            del self._disk[key]
+        self._disk.sync()
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self):
+        self._disk.close()
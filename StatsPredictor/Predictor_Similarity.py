@@ -0,0 +1,123 @@
+#imports
+import hashlib
+import os
+import joblib
+import pandas as pd
+from sklearn.neighbors import BallTree
+from Predictor_Build_Manifest import file_hash
+from Predictor_Data import model_dir, num_features, load_datasets, load_careers, prepare_training_data
+
+#saved spatial index, rebuilt when the cleaned data changes
+similarity_index_path = f'{model_dir}similarity_index.pkl'
+
+#cleaned data the index is built from, d19 fits the scaler and the career table supplies the players
+index_files = ['CLEANED_DATA/D19_CLEAN.csv', 'CLEANED_DATA/CAREERS.csv']
+
+#id of the index the current data would produce
+def index_version():
+    return hashlib.sha256('|'.join(file_hash(path) or '' for path in index_files).encode()).hexdigest()[:16]
+
+#latest snapshot of every career, d24 when the player is in it and d19 otherwise
+def latest_snapshot(careers):
+    return pd.DataFrame({col: careers[f'{col}_24'].fillna(careers[f'{col}_19']) for col in num_features},
+                        index=careers.index).astype(float)
+
+#scale the latest snapshots like the training data and build one tree for everyone and one for retired players
+def build_similarity_index():
+    d19, d24 = load_datasets()
+    careers, name_index = load_careers()
+    X, y, scaler_features, scaler_target = prepare_training_data(d19)
+
+    latest = latest_snapshot(careers)
+    scaled = pd.DataFrame(scaler_features.transform(latest[num_features]), index=latest.index, columns=num_features)
+    retired = latest['CurrentPlayer'] == 0
+
+    index = {
+        'version': index_version(),
+        'features': scaled,
+        'ids': scaled.index.to_numpy(),
+        'tree': BallTree(scaled.to_numpy()),
+        'retired_ids': scaled.index[retired].to_numpy(),
+        'retired_tree': BallTree(scaled[retired].to_numpy()),
+    }
+    os.makedirs(model_dir, exist_ok=True)
+    #write then rename so another process never loads a half-written file
+    joblib.dump(index, f'{similarity_index_path}.tmp')
+    os.replace(f'{similarity_index_path}.tmp', similarity_index_path)
+    return index
+
+#saved index if it was built from the current data, otherwise a freshly built one
+def load_similarity_index():
+    if os.path.exists(similarity_index_path):
+        index = joblib.load(similarity_index_path)
+        if index['version'] == index_version():
+            return index
+    return build_similarity_index()
+
+#k nearest careers for one or more player ids, the player themself is never returned
+def find_similar(index, player_ids, k=5, retired_only=False):
+    if isinstance(player_ids, str):
+        player_ids = [player_ids]
+    tree, ids = (index['retired_tree'], index['retired_ids']) if retired_only else (index['tree'], index['ids'])
+
+    #one extra neighbour covers the query player finding themself
+    queries = index['features'].loc[player_ids].to_numpy()
+    distances, positions = tree.query(queries, k=min(k + 1, len(ids)))
+    neighbour_ids = ids[positions]
+
+    rows = []
+    for player_id, row_ids, row_distances in zip(player_ids, neighbour_ids, distances):
+        keep = row_ids != player_id
+        for rank, (neighbour_id, distance) in enumerate(zip(row_ids[keep][:k], row_distances[keep][:k]), start=1):
+            rows.append({'PlayerID': player_id, 'Rank': rank, 'SimilarID': neighbour_id, 'Distance': distance})
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    index = load_similarity_index()
+    careers, name_index = load_careers()
+
+    while True:
+        #one or more player names, lower() is used standardize player name from input and data
+        while True:
+            names = [name.strip().lower() for name in input("Enter Player Names (comma-separated): ").split(',') if name.strip()]
+            missing = [name for name in names if name not in name_index]
+            if names and not missing:
+                break
+            print(f"Player Not Found in Dataset: {', '.join(missing) or 'none entered'}. Please Enter Valid Player Names.")
+
+        while True:
+            try:
+                k = int(input("How Many Similar Players to Show? "))
+                if k > 0:
+                    break
+                print("Please Enter a Positive Number.")
+            except ValueError:
+                print("Invalid Input. Please Enter a Valid Number.")
+
+        while True:
+            retired_only = input("Only Show Retired Players? (yes/no): ").strip().lower()
+            if retired_only in ['yes', 'no']:
+                break
+            else:
+                print("Please Enter 'yes' or 'no'.")
+
+        similar = find_similar(index, [name_index[name] for name in names], k, retired_only == 'yes')
+        latest = latest_snapshot(careers)
+        for player_id, group in similar.groupby('PlayerID', sort=False):
+            print(f"\n----- CAREERS MOST LIKE {careers.loc[player_id, 'PlayerName'].upper()} -----")
+            for row in group.itertuples(index=False):
+                stats = latest.loc[row.SimilarID]
+                print(f"{row.Rank}. {careers.loc[row.SimilarID, 'PlayerName']} ({careers.loc[row.SimilarID, 'Country']}) - "
+                      f"Innings: {int(stats['Innings'])}, Average: {stats['Average']:.2f}, Distance: {row.Distance:.3f}")
+
+        #another search
+        while True:
+            another = input("Do You Want to Search for Another Player? (yes/no): ").strip().lower()
+            if another in ['yes', 'no']:
+                break
+            else:
+                print("Please Enter 'yes' or 'no'.")
+        if another == 'no':
+            print("Exiting Similarity Search")
+            break
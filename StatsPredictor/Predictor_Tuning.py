@@ -0,0 +1,97 @@
+#imports
+import hashlib
+import itertools
+import json
+import os
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import r2_score
+from sklearn.model_selection import KFold
+from Predictor_Data import (model_dir, tuned_params_path, load_datasets,
+                            prepare_training_data, split_training_data)
+
+#cached fold splits
+folds_path = f'{model_dir}cv_folds.pkl'
+
+#candidate configurations
+param_grid = {
+    'max_depth': [None, 10, 20],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': [1.0, 0.5, 'sqrt'],
+}
+
+#successive halving settings, trees are the resource grown each round
+N_SPLITS = 10
+MIN_TREES = 20
+FACTOR = 3
+N_JOBS = -1 #all cores
+
+#fold indices reused across rounds and runs, rebuilt when the training data changes
+def get_fold_splits(X_train):
+    data_hash = hashlib.sha256(pd.util.hash_pandas_object(X_train, index=True).values.tobytes()).hexdigest()
+    if os.path.exists(folds_path):
+        cached = joblib.load(folds_path)
+        if cached['data_hash'] == data_hash and cached['n_splits'] == N_SPLITS:
+            return cached['splits']
+
+    kfold = KFold(n_splits=N_SPLITS, shuffle=True, random_state=42)
+    splits = list(kfold.split(X_train))
+    joblib.dump({'data_hash': data_hash, 'n_splits': N_SPLITS, 'splits': splits}, folds_path)
+    return splits
+
+#fit one configuration on one fold and score it
+def score_fold(params, n_estimators, X, y, train_idx, val_idx):
+    model = RandomForestRegressor(n_estimators=n_estimators, random_state=42, **params)
+    model.fit(X[train_idx], y[train_idx])
+    return r2_score(y[val_idx], model.predict(X[val_idx]))
+
+#successive halving: score every surviving configuration on every fold in parallel, keep the best 1/FACTOR
+def successive_halving(X, y, splits):
+    candidates = [dict(zip(param_grid, values)) for values in itertools.product(*param_grid.values())]
+    n_estimators = MIN_TREES
+    round_number = 1
+
+    with Parallel(n_jobs=N_JOBS) as parallel:
+        while True:
+            fold_scores = parallel(
+                delayed(score_fold)(params, n_estimators, X, y, train_idx, val_idx)
+                for params in candidates
+                for train_idx, val_idx in splits
+            )
+            mean_scores = np.asarray(fold_scores).reshape(len(candidates), len(splits)).mean(axis=1)
+            order = np.argsort(mean_scores)[::-1]
+
+            print(f"\nROUND {round_number}: {len(candidates)} configurations, {n_estimators} trees")
+            print(f"Best Mean R² Score: {mean_scores[order[0]]:.4f} with {candidates[order[0]]}")
+
+            if len(candidates) <= FACTOR:
+                return candidates[order[0]], n_estimators, float(mean_scores[order[0]])
+
+            #discard weak configurations and grow the forest for the survivors
+            keep = max(1, len(candidates) // FACTOR)
+            candidates = [candidates[i] for i in order[:keep]]
+            n_estimators *= FACTOR
+            round_number += 1
+
+#load and prepare the training split used by Predictor_Model.py
+d19, d24 = load_datasets()
+X, y, scaler_features, scaler_target = prepare_training_data(d19)
+X_train, X_test, y_train, y_test = split_training_data(X, y)
+
+os.makedirs(model_dir, exist_ok=True)
+splits = get_fold_splits(X_train)
+
+best_params, best_trees, best_score = successive_halving(
+    X_train.to_numpy(dtype=float), y_train.to_numpy().ravel(), splits)
+
+#save the winning hyperparameters for the training step
+with open(tuned_params_path, 'w') as f:
+    json.dump({'params': {'n_estimators': best_trees, **best_params}, 'cv_r2': best_score}, f, indent=4)
+
+print("\nTUNING RESULTS")
+print(f"Best Hyperparameters: {best_params}, n_estimators={best_trees}")
+print(f"Mean CV R² Score: {best_score:.4f}")
+print(f"Saved to {tuned_params_path}")